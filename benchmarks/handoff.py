@@ -0,0 +1,71 @@
+import hashlib
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+
+from channels.handoff import HandoffPool
+from channels.poller import Poller
+
+
+def _work(data, channel):
+    if isinstance(data, bytes) and data:
+        digest = data
+        for _ in range(2000):
+            digest = hashlib.sha256(digest).digest()
+        channel.write(digest)
+
+
+def _client(address, requests):
+    sock = socket.create_connection(address)
+    for i in range(requests):
+        sock.sendall(str(i).encode())
+        sock.recv(64)
+    sock.close()
+
+
+def _accept(acceptor, pool, stop):
+    while not stop.is_set():
+        for (addr, channel), _ in acceptor.poll(0.05):
+            acceptor.unregister(channel)
+            pool.dispatch(channel, addr)
+
+
+def run(workers, clients=8, requests=200):
+    pool = HandoffPool(_work, workers=workers)
+    pool.start()
+    serv = socket.socket()
+    serv.bind(('127.0.0.1', 0))
+    serv.listen(clients)
+    acceptor = Poller()
+    acceptor.add_server(serv)
+    stop = threading.Event()
+    thread = threading.Thread(target=_accept, args=(acceptor, pool, stop))
+    thread.start()
+
+    procs = [multiprocessing.Process(target=_client, args=(serv.getsockname(), requests))
+             for _ in range(clients)]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    thread.join()
+    acceptor.close_all()
+    pool.stop(1)
+    return clients * requests / elapsed
+
+
+def main(max_workers=4):
+    workers = 1
+    while workers <= max_workers:
+        print("{} worker(s): {:.0f} requests/s".format(workers, run(workers)))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,29 @@
+import sys
+import threading
+import time
+
+from channels.testing import TestChannel
+
+
+def main(total=10 * 1024 * 1024, line=b'0123456789abcde\n'):
+    chan = TestChannel(buffering='line')
+    count = total // len(line)
+    burst = line * count
+
+    feeder = threading.Thread(target=chan.put, args=(burst,))
+    start = time.perf_counter()
+    feeder.start()
+    received = 0
+    while received < count:
+        if chan.read():
+            received += 1
+    feeder.join()
+    elapsed = time.perf_counter() - start
+    chan.close()
+
+    print("{} lines ({} bytes) in {:.3f}s, {:.0f} lines/s".format(
+        count, len(burst), elapsed, count / elapsed))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -1 +1 @@
-from .channel import Channel, PipeChannel, SocketChannel, EndpointClosedException
+from .channel import Channel, PipeChannel, FileChannel, SocketChannel, DatagramChannel, EndpointClosedException, LineTooLongException
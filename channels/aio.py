@@ -0,0 +1,149 @@
+import asyncio
+
+from .channel import EndpointClosedException
+from .poller import Poller
+
+
+async def _wait_fd(add, remove, fd):
+    future = asyncio.get_running_loop().create_future()
+
+    def ready():
+        if not future.done():
+            future.set_result(None)
+
+    add(fd, ready)
+    try:
+        await future
+    finally:
+        remove(fd)
+
+
+class AsyncChannel:
+
+    def __init__(self, channel):
+        self._channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._fd = channel.get_fd()
+        self._writing = False
+        self._drained = None
+        channel._write_listener = self._write_state_changed
+
+    @property
+    def channel(self):
+        return self._channel
+
+    async def _readable(self):
+        await _wait_fd(self._loop.add_reader, self._loop.remove_reader, self._fd)
+
+    async def _read_with(self, read):
+        while True:
+            data = read()
+            if data:
+                return data
+            await self._readable()
+
+    async def read(self):
+        return await self._read_with(self._channel.read)
+
+    async def readline(self):
+        return await self._read_with(self._channel._readline)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.readline()
+        except EndpointClosedException:
+            raise StopAsyncIteration
+
+    def write(self, *data):
+        return self._channel.write(*data)
+
+    def _write_state_changed(self, channel):
+        pending = bool(channel.write_buffer_size)
+        if pending and not self._writing:
+            self._loop.add_writer(self._fd, self._flush)
+        elif not pending and self._writing:
+            self._loop.remove_writer(self._fd)
+        self._writing = pending
+
+    def _flush(self):
+        try:
+            self._channel.flush()
+        except EndpointClosedException as ex:
+            self._loop.remove_writer(self._fd)
+            self._writing = False
+            self._wake_drain(ex)
+            return
+        if not self._channel.write_paused:
+            self._wake_drain()
+
+    def _wake_drain(self, exception=None):
+        drained, self._drained = self._drained, None
+        if drained is None or drained.done():
+            return
+        if exception is None:
+            drained.set_result(None)
+        else:
+            drained.set_exception(exception)
+
+    async def drain(self):
+        if not self._channel.write_paused:
+            return
+        if self._drained is None:
+            self._drained = self._loop.create_future()
+        await asyncio.shield(self._drained)
+
+    def close(self):
+        if self._writing:
+            self._loop.remove_writer(self._fd)
+            self._writing = False
+        self._channel._write_listener = None
+        self._channel.close()
+
+
+class AsyncPoller:
+
+    def __init__(self, **poller_options):
+        poller_options.setdefault('backend', 'epoll')
+        self._poller = Poller(**poller_options)
+        self._loop = asyncio.get_running_loop()
+
+    @property
+    def poller(self):
+        return self._poller
+
+    def register(self, channel):
+        self._poller.register(channel)
+
+    def unregister(self, channel):
+        self._poller.unregister(channel)
+
+    def add_server(self, server):
+        self._poller.add_server(server)
+
+    def close_all(self):
+        self._poller.close_all()
+
+    async def poll(self, timeout=None):
+        result = self._poller.poll(0)
+        if result:
+            return result
+        wait = _wait_fd(self._loop.add_reader, self._loop.remove_reader,
+                        self._poller.fileno())
+        try:
+            # timers of the poller are due no later than this
+            await asyncio.wait_for(wait, self._poller._timeout(timeout))
+        except asyncio.TimeoutError:
+            pass
+        return self._poller.poll(0)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            result = await self.poll()
+            if result:
+                return result
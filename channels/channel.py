@@ -1,22 +1,136 @@
+import ctypes
+import errno
 import fcntl
+import io
+import mmap
 import os
+import socket
+import stat
+import struct
+import time
 
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from itertools import islice
+
+
+_COMPACT_MIN = 65536
+
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError): #pragma: no cover
+    _IOV_MAX = 16
+if _IOV_MAX <= 0: #pragma: no cover
+    _IOV_MAX = 16
+
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_FILE_EVENTS = _IN_MODIFY | _IN_ATTRIB | _IN_DELETE_SELF | _IN_MOVE_SELF
+
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _libc.inotify_init1
+except (OSError, AttributeError): #pragma: no cover
+    _libc = None
+
+
+def _inotify_init():
+    if _libc is None: #pragma: no cover
+        return None
+    fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    return fd if fd >= 0 else None
+
+
+def _inotify_add_watch(fd, path, mask):
+    return _libc.inotify_add_watch(fd, os.fsencode(path), mask)
+
+
+def _fd_kind(fd):
+    mode = os.fstat(fd).st_mode
+    if stat.S_ISFIFO(mode):
+        return 'fifo'
+    if stat.S_ISREG(mode):
+        return 'file'
+    return 'other'
+
+
+def _advance(chunks, count):
+    for i, chunk in enumerate(chunks):
+        if count < len(chunk):
+            rest = [memoryview(chunk)[count:]]
+            rest.extend(chunks[i+1:])
+            return rest
+        count -= len(chunk)
+    return []
 
 
 class EndpointClosedException(Exception):
     pass
 
 
+class LineTooLongException(Exception):
+
+    def __init__(self, data):
+        super().__init__("Line is longer than {} bytes".format(len(data)))
+        self.data = data
+
+
 class Channel(metaclass=ABCMeta):
 
-    def __init__(self, *, buffering='bytes'):
-        self._buffer = b''
+    _default_read_size = 4096
+    _poll_interval = None
+
+    def __init__(self, *, buffering='bytes',
+                 high_watermark=65536, low_watermark=None,
+                 read_size=None, max_read_size=None, read_budget=None,
+                 frame_header='!I', delimiter=b'\n', max_line=None,
+                 overflow='truncate', write_buffering=False,
+                 flush_threshold=65536, flush_interval=None):
+        self._buffer = bytearray()
+        self._pos = 0
         self._lf = 0
+        self._delimiter = delimiter
+        self._max_line = max_line
+        if overflow not in ('truncate', 'close'):
+            raise ValueError("Unknown overflow mode {!r}".format(overflow))
+        self._overflow_mode = overflow
+        self._discarding = False
+
+        self._out_queue = deque()
+        self._out_pending = 0
+        self._high_watermark = high_watermark
+        if low_watermark is None:
+            low_watermark = high_watermark // 4
+        self._low_watermark = low_watermark
+        self._write_paused = False
+        self._write_listener = None
+        self._write_buffering = write_buffering
+        self._flush_threshold = flush_threshold
+        self._flush_interval = flush_interval
+        self._corked = False
+        self._corked_at = None
+        self._forward_buffer = None
+        self._kernel_forward = True
+        self._fd_kinds = {}
+
+        if read_size is None:
+            read_size = self._default_read_size
+        self._min_read_size = self._read_size = read_size
+        self._max_read_size = max_read_size
+        self._read_budget = read_budget
+
+        self._frame_header = struct.Struct(frame_header)
 
         self._buffering = buffering
         if buffering == 'line':
             self.read = self._readline
+        elif buffering == 'frame':
+            self.read = self._readframe
         else:
             self.read = self._read
 
@@ -24,10 +138,50 @@ class Channel(metaclass=ABCMeta):
     def buffering(self):
         return self._buffering
 
-    @abstractmethod
-    def _read(self): #pragma: no cover
+    @property
+    def write_buffer_size(self):
+        return self._out_pending
+
+    @property
+    def write_paused(self):
+        return self._write_paused
+
+    @property
+    def read_size(self):
+        return self._read_size
+
+    def _read_chunk(self, size): #pragma: no cover
         raise NotImplementedError
 
+    def _adapt_read_size(self, count):
+        if self._max_read_size is None or not count:
+            return
+        if count >= self._read_size:
+            self._read_size = min(self._read_size * 2, self._max_read_size)
+        elif count * 2 < self._read_size:
+            self._read_size = max(self._read_size // 2, self._min_read_size)
+
+    def _read(self):
+        data = self._read_chunk(self._read_size)
+        self._adapt_read_size(len(data))
+        if self._read_budget is None or not data:
+            return data
+        chunks = [data]
+        total = len(data)
+        while total < self._read_budget:
+            size = min(self._read_size, self._read_budget - total)
+            try:
+                data = self._read_chunk(size)
+            except EndpointClosedException:
+                break  # reported by the next read
+            if not data:
+                break
+            if size == self._read_size:
+                self._adapt_read_size(len(data))
+            chunks.append(data)
+            total += len(data)
+        return b''.join(chunks)
+
     @abstractmethod
     def write(self, *data): #pragma: no cover
         raise NotImplementedError
@@ -39,36 +193,340 @@ class Channel(metaclass=ABCMeta):
     def get_fd(self): #pragma: no cover
         raise NotImplementedError
 
+    def _sendv(self, chunks): #pragma: no cover
+        raise NotImplementedError
+
+    def _writev(self, chunks):
+        total = 0
+        while chunks:
+            batch = chunks[:_IOV_MAX]
+            sent = self._sendv(batch)
+            total += sent
+            if sent < sum(map(len, batch)):
+                break
+            chunks = chunks[_IOV_MAX:]
+        return total
+
+    def _enqueue(self, data):
+        was_empty = not self._out_pending
+        for d in data:
+            if d:
+                if isinstance(d, bytearray) or isinstance(d, memoryview) and not d.readonly:
+                    d = bytes(d)
+                self._out_queue.append(d)
+                self._out_pending += len(d)
+        if self._out_pending > self._high_watermark:
+            self._write_paused = True
+        if was_empty and self._out_pending and self._write_listener is not None:
+            self._write_listener(self)
+
+    def _write_buffered(self, data):
+        if not self._out_queue:
+            self._corked = True
+            if self._flush_interval is not None:
+                self._corked_at = time.monotonic()
+        self._enqueue(data)
+        if not self._corked:
+            return 0  # waiting for the descriptor to become writable
+        if self._out_pending < self._flush_threshold and (
+                self._flush_interval is None
+                or time.monotonic() - self._corked_at < self._flush_interval):
+            return 0
+        before = self._out_pending
+        self.flush()
+        return before - self._out_pending
+
+    def flush(self):
+        queue = self._out_queue
+        corked, self._corked = self._corked, False
+        if not queue:
+            return True
+        try:
+            while queue:
+                batch = list(islice(queue, _IOV_MAX))
+                sent = self._sendv(batch)
+                self._out_pending -= sent
+                short = sent < sum(map(len, batch))
+                while sent and sent >= len(queue[0]):
+                    sent -= len(queue.popleft())
+                if sent:
+                    queue[0] = memoryview(queue[0])[sent:]
+                if short:
+                    break
+        except OSError as ex:
+            raise EndpointClosedException(ex)
+        finally:
+            if self._out_pending <= self._low_watermark:
+                self._write_paused = False
+        if (corked or not queue) and self._write_listener is not None:
+            self._write_listener(self)
+        return not queue
+
+    def _final_flush(self):
+        if self._out_queue:
+            try:
+                self.flush()
+            except EndpointClosedException:
+                pass
+
+    def _buffered(self):
+        return len(self._buffer) - self._pos
+
+    def _input_pending(self):
+        return bool(self._buffered())
+
+    def _more_input(self):
+        return False
+
+    def _find_delimiter(self, start):
+        found = self._buffer.find(self._delimiter, start)
+        self._lf = found + len(self._delimiter) if found >= 0 else 0
+
     def _read_into_buffer(self):
         new_bytes = self._read()
-        self._lf = new_bytes.find(b'\n')+1
-        if self._lf:
-            self._lf += len(self._buffer)
+        if not new_bytes:
+            return 0
+        start = max(len(self._buffer) - len(self._delimiter) + 1, self._pos)
         self._buffer += new_bytes
+        if self._discarding:
+            self._discard(start)
+        elif not self._lf and self._buffering != 'frame':
+            self._find_delimiter(start)
+        return len(new_bytes)
+
+    def _discard(self, start):
+        self._find_delimiter(start)
+        if self._lf:
+            self._pos = self._lf
+            self._discarding = False
+            self._find_delimiter(self._pos)
+            self._compact()
+        else:
+            keep = len(self._delimiter) - 1
+            del self._buffer[:len(self._buffer)-keep]
+            self._pos = 0
+
+    def _compact(self):
+        # Consumed bytes are only dropped once they make up at least half
+        # of the buffer, so every byte is moved a bounded number of times.
+        if self._pos >= _COMPACT_MIN and self._pos * 2 >= len(self._buffer):
+            del self._buffer[:self._pos]
+            if self._lf:
+                self._lf -= self._pos
+            self._pos = 0
+
+    def _line_too_long(self):
+        if self._max_line is None:
+            return False
+        if self._lf:
+            length = self._lf - len(self._delimiter) - self._pos
+        else:
+            length = self._buffered()
+        return length > self._max_line
+
+    def _tail_too_long(self):
+        # data after the last complete line, it can only grow while reading
+        if self._max_line is None or self._discarding or self._buffering != 'line':
+            return False
+        end = self._buffer.rfind(self._delimiter, self._pos)
+        start = self._pos if end < 0 else end + len(self._delimiter)
+        return len(self._buffer) - start > self._max_line
+
+    def _overflow(self):
+        data = bytes(self._buffer[self._pos:self._pos+self._max_line])
+        if self._overflow_mode == 'close':
+            self._get_rest()
+            self.close()
+        elif self._lf:
+            self._pos = self._lf
+            self._find_delimiter(self._pos)
+            self._compact()
+        else:
+            self._get_rest()
+            self._discarding = True
+        raise LineTooLongException(data)
+
+    def _line_ready(self):
+        if self._line_too_long():
+            self._overflow()
+        return self._lf
 
     def _get_first_line(self):
-        result, self._buffer = self._buffer[:self._lf], self._buffer[self._lf:]
-        self._lf = self._buffer.find(b'\n')+1
+        result = bytes(self._buffer[self._pos:self._lf])
+        self._pos = self._lf
+        self._find_delimiter(self._pos)
+        self._compact()
         return result
 
-    def _readline(self):
-        if self._lf:
-            return self._get_first_line()
+    def _has_rest(self):
+        if self._discarding:
+            self._discarding = False
+            self._get_rest()
+        return self._buffered()
+
+    def _get_rest(self):
+        result = bytes(self._buffer[self._pos:])
+        self._buffer = bytearray()
+        self._pos = self._lf = 0
+        return result
 
+    def _split_lines(self):
+        if self._max_line is not None:
+            result = []
+            while self._lf and not self._line_too_long():
+                result.append(self._get_first_line())
+            if not result:
+                self._line_ready()
+            return result
+        if not self._lf:
+            return []
+        delimiter = self._delimiter
+        end = self._buffer.rfind(delimiter, self._lf - len(delimiter)) + len(delimiter)
+        data = bytes(self._buffer[self._pos:end])
+        self._pos = end
+        self._lf = 0
+        self._compact()
+        if delimiter == b'\n' and b'\r' not in data:
+            return data.splitlines(True)
+        lines = data.split(delimiter)
+        lines.pop()
+        return [line + delimiter for line in lines]
+
+    def readlines(self):
         try:
             self._read_into_buffer()
         except EndpointClosedException:
-            if not self._buffer:
+            if not self._has_rest():
                 raise
+            result = self._split_lines()
+            if not self._lf and not (result and self._line_too_long()):
+                if not result:
+                    self._line_ready()
+                if self._buffered():
+                    result.append(self._get_rest())
+            return result
+        return self._split_lines()
+
+    def _frame_ready(self):
+        header = self._frame_header
+        if self._buffered() < header.size:
+            return False
+        length, = header.unpack_from(self._buffer, self._pos)
+        return len(self._buffer) >= self._pos + header.size + length
+
+    def _get_frame(self):
+        if not self._frame_ready():
+            return None
+        header = self._frame_header
+        length, = header.unpack_from(self._buffer, self._pos)
+        start = self._pos + header.size
+        result = bytes(self._buffer[start:start+length])
+        self._pos = start + length
+        self._compact()
+        return result
 
-        if self._lf:
+    def _readframe(self):
+        while True:
+            result = self._get_frame()
+            if result is None:
+                try:
+                    if not self._read_into_buffer():
+                        return b''
+                except EndpointClosedException:
+                    self._get_rest()  # incomplete frame can't be delivered
+                    raise
+            elif result:
+                # an empty frame would look like no data, skip it
+                return result
+
+    def write_frame(self, *data):
+        length = sum(map(len, data))
+        return self.write(self._frame_header.pack(length), *data)
+
+    def _read_into(self, buf):
+        data = self._read()
+        buf[:len(data)] = data
+        return len(data)
+
+    def read_into(self, buf):
+        buffered = self._buffered()
+        if not buffered:
+            return self._read_into(buf)
+        count = min(len(buf), buffered)
+        buf[:count] = self._buffer[self._pos:self._pos+count]
+        self._pos += count
+        if self._lf and self._lf <= self._pos:
+            self._find_delimiter(self._pos)
+        self._compact()
+        return count
+
+    def _source_fd(self):
+        return None
+
+    def _sink_fd(self):
+        return None
+
+    def _fd_kind(self, fd):
+        kind = self._fd_kinds.get(fd)
+        if kind is None:
+            kind = self._fd_kinds[fd] = _fd_kind(fd)
+        return kind
+
+    def _splice_to(self, other, max_bytes):
+        if not self._kernel_forward:
+            return None
+        source, sink = self._source_fd(), other._sink_fd()
+        if source is None or sink is None:
+            return None
+        kinds = (self._fd_kind(source), other._fd_kind(sink))
+        try:
+            if 'fifo' in kinds and hasattr(os, 'splice'):
+                count = os.splice(source, sink, max_bytes,
+                                  flags=os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK)
+            elif kinds[0] == 'file':
+                count = os.sendfile(sink, source, None, max_bytes)
+            else:
+                return None
+        except BlockingIOError:
+            return None  # let the buffered path find out which side is not ready
+        except OSError as ex:
+            if ex.errno in (errno.EINVAL, errno.ENOSYS):
+                self._kernel_forward = False
+                return None
+            raise EndpointClosedException(ex)
+        if not count:
+            raise EndpointClosedException()
+        return count
+
+    def forward_to(self, other, max_bytes=65536):
+        if other.write_buffer_size:
+            return 0
+        if not self._buffered():
+            count = self._splice_to(other, max_bytes)
+            if count is not None:
+                return count
+        buf = self._forward_buffer
+        if buf is None or len(buf) < max_bytes:
+            buf = self._forward_buffer = memoryview(bytearray(max_bytes))
+        count = self.read_into(buf[:max_bytes])
+        if count:
+            other.write(buf[:count])
+        return count
+
+    def _readline(self):
+        if self._line_ready():
             return self._get_first_line()
 
         try:
             self._read_into_buffer()
         except EndpointClosedException:
-            result, self._buffer = self._buffer, b''
-            return result
+            if not self._has_rest():
+                raise
+            self._line_ready()
+            return self._get_rest()
+
+        if self._line_ready():
+            return self._get_first_line()
         return b''
 
 
@@ -76,6 +534,7 @@ class PipeChannel(Channel):
 
     _in = None
     _out = None
+    _default_read_size = 65536
 
     def __init__(self, faucet=None, sink=None, **kwargs):
         super().__init__(**kwargs)
@@ -86,9 +545,9 @@ class PipeChannel(Channel):
         if sink is not None:
             self._out = os.fdopen(sink, mode='wb', buffering=0)
 
-    def _read(self):
+    def _read_chunk(self, size):
         try:
-            result = self._in.read()
+            result = self._in.read(size)
             if result is None:
                 return b''
             if not result:
@@ -97,15 +556,37 @@ class PipeChannel(Channel):
         except (ValueError, OSError) as ex:
             raise EndpointClosedException(ex)
 
+    def _read_into(self, buf):
+        try:
+            result = self._in.readinto(buf)
+            if result is None:
+                return 0
+            if not result and len(buf):
+                raise EndpointClosedException()
+            return result
+        except (ValueError, OSError) as ex:
+            raise EndpointClosedException(ex)
+
+    def _sendv(self, chunks):
+        return os.writev(self._out.fileno(), chunks)
+
     def write(self, *data):
+        if self._write_buffering:
+            return self._write_buffered(data)
+        total = 0
+        chunks = [d for d in data if d]
         try:
-            for d in data:
-                self._out.write(d)
-            self._out.flush()
+            # the sink is blocking, short writes only happen on signals
+            while chunks:
+                written = self._writev(chunks)
+                total += written
+                chunks = _advance(chunks, written)
         except (ValueError, OSError) as ex:
             raise EndpointClosedException(ex)
+        return total
 
     def close(self):
+        self._final_flush()
         if self._in is not None:
             self._in.close()
         if self._out is not None:
@@ -116,17 +597,251 @@ class PipeChannel(Channel):
             return self._in.fileno()
         return super().get_fd()
 
+    def _source_fd(self):
+        if self._in is not None:
+            return self._in.fileno()
+
+    def _sink_fd(self):
+        if self._out is not None:
+            return self._out.fileno()
+
+
+class FileChannel(Channel):
+
+    _default_read_size = 65536
+
+    def __init__(self, path, *, follow=False, from_end=False, views=False,
+                 watch='auto', poll_interval=0.1, **kwargs):
+        super().__init__(**kwargs)
+        if watch not in ('auto', 'inotify', 'timer'):
+            raise ValueError("Unknown watch mode {!r}".format(watch))
+        self._path = path
+        self._follow = follow
+        self._views = views
+        self._file = None
+        self._map = None
+        self._size = 0
+        self._offset = 0
+        self._inotify = None
+        self._doorbell = None
+        self._rung = False
+        self._open()
+        if from_end:
+            self._offset = self._size
+        if follow and watch != 'timer':
+            self._inotify = _inotify_init()
+            if self._inotify is None and watch == 'inotify':
+                self._file.close()
+                raise OSError("inotify is not available")
+        if self._inotify is not None:
+            self._watch()
+            _inotify_add_watch(self._inotify, os.path.dirname(os.path.abspath(path)),
+                               _IN_CREATE | _IN_MOVED_TO)
+        else:
+            self._doorbell = os.pipe()
+            for fd in self._doorbell:
+                os.set_blocking(fd, False)
+            if follow:
+                self._poll_interval = poll_interval
+                self._check()
+            else:
+                os.write(self._doorbell[1], b'\0')
+
+    def _open(self):
+        self._file = open(self._path, 'rb', buffering=0)
+        self._map = None
+        self._size = self._offset = 0
+        self._refresh()
+
+    def _watch(self):
+        if _inotify_add_watch(self._inotify, self._path, _IN_FILE_EVENTS) < 0:
+            raise OSError(ctypes.get_errno(), "Can't watch {}".format(self._path))
+
+    def _refresh(self):
+        size = os.fstat(self._file.fileno()).st_size
+        truncated = size < self._size
+        if truncated:
+            self._offset = 0
+        if size != self._size:
+            self._map = mmap.mmap(self._file.fileno(), size,
+                                  access=mmap.ACCESS_READ) if size else None
+            self._size = size
+        return not truncated
+
+    def _rotated(self):
+        try:
+            return os.stat(self._path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _drain_events(self):
+        fd = self._inotify
+        if fd is None:
+            fd = self._doorbell[0]
+            self._rung = False
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _update(self):
+        if self._file is None:
+            raise EndpointClosedException()
+        if not self._follow:
+            return True  # the doorbell stays ready until the end of file is reported
+        self._drain_events()
+        if not self._refresh():
+            return False
+        if self._offset == self._size and self._rotated():
+            self._file.close()
+            self._open()
+            if self._inotify is not None:
+                self._watch()
+            return False
+        return True
+
+    def _check(self):
+        if self._rung or self._file is None:
+            return
+        if self._offset < os.fstat(self._file.fileno()).st_size or self._rotated():
+            self._rung = True
+            os.write(self._doorbell[1], b'\0')
+
+    def _available(self):
+        if self._file is None or self._offset == self._size:
+            self._update()
+        return self._size - self._offset
+
+    def _input_pending(self):
+        return bool(self._buffered() or self._offset < self._size)
+
+    def _more_input(self):
+        # the descriptor is not readable again for data that is already mapped,
+        # mapped lines are all read, only an incomplete one is left
+        if self._file is None or self._buffering == 'line' and self._mapped():
+            return False
+        return self._offset < self._size
+
+    def _end(self):
+        if self._follow:
+            return b''
+        raise EndpointClosedException()
+
+    def _read_chunk(self, size):
+        available = self._available()
+        if not available:
+            return self._end()
+        start = self._offset
+        self._offset += min(size, available)
+        return self._map[start:self._offset]
+
+    def _read_into(self, buf):
+        available = self._available()
+        if not available:
+            self._end()
+            return 0
+        count = min(len(buf), available)
+        buf[:count] = self._map[self._offset:self._offset+count]
+        self._offset += count
+        return count
+
+    def _splice_to(self, other, max_bytes):
+        sink = other._sink_fd()
+        if sink is None or not self._available():
+            return None
+        try:
+            count = os.sendfile(sink, self._file.fileno(), self._offset,
+                                min(max_bytes, self._size - self._offset))
+        except BlockingIOError:
+            return None
+        except OSError as ex:
+            raise EndpointClosedException(ex)
+        self._offset += count
+        return count
+
+    def _slice(self, start, end):
+        if self._views:
+            return memoryview(self._map)[start:end]
+        return self._map[start:end]
+
+    def _next_line(self, start):
+        if self._map is None:
+            return None
+        end = self._map.find(self._delimiter, max(start, self._offset))
+        if end < 0:
+            return None
+        start, self._offset = self._offset, end + len(self._delimiter)
+        return self._slice(start, self._offset)
+
+    def _mapped(self):
+        return self._max_line is None and not self._buffered()
+
+    def _readline(self):
+        if not self._mapped():
+            return super()._readline()
+        line = self._next_line(self._offset)
+        if line is not None:
+            return line
+        scanned = self._size - len(self._delimiter) + 1
+        if not self._update():
+            scanned = 0
+        line = self._next_line(scanned)
+        if line is not None:
+            return line
+        if self._offset == self._size:
+            return self._end()
+        if self._follow:
+            return b''
+        start, self._offset = self._offset, self._size
+        return self._slice(start, self._size)
+
+    def readlines(self):
+        if not self._mapped():
+            return super().readlines()
+        result = []
+        while True:
+            try:
+                line = self._readline()
+            except EndpointClosedException:
+                if result:
+                    return result
+                raise
+            if not line:
+                return result
+            result.append(line)
+
+    def write(self, *data):
+        raise io.UnsupportedOperation("FileChannel is read-only")
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = self._map = None
+        for fd in self._doorbell or (self._inotify,):
+            os.close(fd)
+
+    def get_fd(self):
+        if self._inotify is not None:
+            return self._inotify
+        return self._doorbell[0]
+
 
 class SocketChannel(Channel):
 
-    def __init__(self, sock, **kwargs):
+    def __init__(self, sock, *, nodelay=None, cork=False, **kwargs):
         super().__init__(**kwargs)
         self._sock = sock
-        self._sock.setblocking(False)
+        if sock.gettimeout() != 0:
+            sock.setblocking(False)
+        if nodelay is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(nodelay))
+        self._cork = cork
 
-    def _read(self):
+    def _read_chunk(self, size):
         try:
-            result = self._sock.recv(4096)
+            result = self._sock.recv(size)
             if not result:
                 raise EndpointClosedException()
             return result
@@ -135,10 +850,110 @@ class SocketChannel(Channel):
         except OSError as ex:
             raise EndpointClosedException(ex)
 
+    def _read_into(self, buf):
+        try:
+            result = self._sock.recv_into(buf)
+            if not result and len(buf):
+                raise EndpointClosedException()
+            return result
+        except BlockingIOError:
+            return 0
+        except OSError as ex:
+            raise EndpointClosedException(ex)
+
+    def _sendv(self, chunks):
+        try:
+            return self._sock.sendmsg(chunks)
+        except BlockingIOError:
+            return 0
+
     def write(self, *data):
+        if self._write_buffering:
+            return self._write_buffered(data)
+        if self._out_queue:
+            self._enqueue(data)
+            return 0
+        try:
+            written = self._writev(data)
+        except OSError as ex:
+            raise EndpointClosedException(ex)
+        rest = _advance(data, written)
+        if rest:
+            self._enqueue(rest)
+        return written
+
+    def flush(self):
+        if not self._cork or len(self._out_queue) <= _IOV_MAX:
+            return super().flush()
+        # several gather writes are needed, let the kernel send full segments
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
         try:
-            for d in data:
-                self._sock.send(d)
+            return super().flush()
+        finally:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+
+    def close(self):
+        self._final_flush()
+        self._out_queue.clear()
+        self._out_pending = 0
+        self._sock.close()
+
+    def get_fd(self):
+        return self._sock.fileno()
+
+    def _source_fd(self):
+        return self._sock.fileno()
+
+    def _sink_fd(self):
+        return self._sock.fileno()
+
+
+class DatagramChannel(Channel):
+
+    def __init__(self, sock, *, batch_size=64, max_size=65535, buffering='bytes'):
+        if buffering != 'bytes':
+            raise ValueError("DatagramChannel does not support {!r} buffering".format(
+                buffering))
+        super().__init__()
+        self._buffering = 'datagram'
+        self.read = self._read_batch
+        self._sock = sock
+        if sock.gettimeout() != 0:
+            sock.setblocking(False)
+        self._batch_size = batch_size
+        self._max_size = max_size
+
+    def _read_batch(self):
+        batch = []
+        recvfrom = self._sock.recvfrom
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(recvfrom(self._max_size))
+            except BlockingIOError:
+                break
+            except ConnectionRefusedError:
+                continue  # error queued by an earlier send
+            except OSError as ex:
+                raise EndpointClosedException(ex)
+        return batch
+
+    def _sendv(self, chunks):
+        try:
+            return self._sock.sendmsg(chunks)
+        except BlockingIOError:
+            return 0
+
+    def write(self, *data):
+        try:
+            return self._sendv(data)
+        except OSError as ex:
+            raise EndpointClosedException(ex)
+
+    def sendto(self, data, addr):
+        try:
+            return self._sock.sendto(data, addr)
+        except BlockingIOError:
+            return 0
         except OSError as ex:
             raise EndpointClosedException(ex)
 
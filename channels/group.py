@@ -0,0 +1,154 @@
+import logging
+import multiprocessing
+import os
+import socket
+
+from .channel import PipeChannel
+from .poller import Poller, PollEvent
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_STATS = ('accepted', 'closed', 'messages', 'bytes')
+
+
+def _bind(family, address, backlog=None):
+    sock = socket.socket(family)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(address)
+    if backlog is not None:
+        sock.listen(backlog)
+    return sock
+
+
+def _serve(poller, control, handler, on_change=None):
+    stats = dict.fromkeys(_STATS, 0)
+    poller.register(control, reap=False)
+    running = True
+    while running:
+        for data, channel in poller.poll():
+            if channel is control:
+                running = False
+                continue
+            changed = False
+            if isinstance(data, PollEvent):
+                pass
+            elif isinstance(data, tuple):
+                stats['accepted'] += 1
+                changed = True
+            elif isinstance(data, list):
+                stats['messages'] += len(data)
+                if channel.buffering == 'datagram':
+                    stats['bytes'] += sum(len(payload) for payload, _ in data)
+                else:
+                    stats['bytes'] += sum(map(len, data))
+            elif isinstance(data, Exception):
+                pass
+            elif data:
+                stats['messages'] += 1
+                stats['bytes'] += len(data)
+            else:
+                stats['closed'] += 1
+                changed = True
+            handler(data, channel)
+            if changed and on_change is not None:
+                on_change(stats)
+    poller.unregister(control)
+    control.close()
+    poller.close_all()
+    return stats
+
+
+def _worker(conn, family, address, backlog, handler, poller_options):
+    server = _bind(family, address, backlog)
+    poller = Poller(**poller_options)
+    poller.add_server(server)
+    control = PipeChannel(os.dup(conn.fileno()))
+    conn.send(os.getpid())
+    conn.send(_serve(poller, control, handler))
+    conn.close()
+
+
+class _WorkerPool:
+
+    def __init__(self, handler, workers, poller_options):
+        self._handler = handler
+        self._workers = workers or os.cpu_count() or 1
+        self._poller_options = poller_options
+        self._processes = []
+        self.worker_stats = []
+
+    def _spawn(self, target, *args):
+        conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=target, args=(child_conn,) + args, daemon=True)
+        process.start()
+        child_conn.close()
+        self._processes.append((process, conn))
+
+    def _wait_ready(self):
+        for process, conn in self._processes:
+            _LOGGER.debug("Worker %d is ready", conn.recv())
+
+    def _stopped(self):
+        pass
+
+    def stop(self, timeout=None):
+        if not self._processes:
+            return self.stats
+        for process, conn in self._processes:
+            try:
+                conn.send_bytes(b'stop')
+            except OSError:
+                pass  # the worker is already gone
+        self.worker_stats = []
+        for process, conn in self._processes:
+            try:
+                if conn.poll(timeout):
+                    self.worker_stats.append(conn.recv())
+            except EOFError:
+                _LOGGER.warning("Worker %d exited without stats", process.pid)
+            conn.close()
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._stopped()
+        return self.stats
+
+    @property
+    def stats(self):
+        result = dict.fromkeys(_STATS, 0)
+        for stats in self.worker_stats:
+            for key in _STATS:
+                result[key] += stats[key]
+        return result
+
+
+class PollerGroup(_WorkerPool):
+
+    def __init__(self, address, handler, *, workers=None,
+                 family=socket.AF_INET, backlog=128, **poller_options):
+        super().__init__(handler, workers, poller_options)
+        self._address = address
+        self._family = family
+        self._backlog = backlog
+        self._reserved = None
+
+    @property
+    def address(self):
+        return self._address
+
+    def start(self):
+        # Holds the address (and resolves port 0) without accepting anything
+        self._reserved = _bind(self._family, self._address)
+        self._address = self._reserved.getsockname()
+        for _ in range(self._workers):
+            self._spawn(_worker, self._family, self._address, self._backlog,
+                        self._handler, self._poller_options)
+        self._wait_ready()
+
+    def _stopped(self):
+        if self._reserved is not None:
+            self._reserved.close()
+            self._reserved = None
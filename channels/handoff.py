@@ -0,0 +1,145 @@
+import array
+import os
+import pickle
+import socket
+
+from .channel import EndpointClosedException, PipeChannel, SocketChannel
+from .group import _WorkerPool, _serve
+from .poller import Poller
+
+
+_MAX_MESSAGE = 4096
+_FD_SIZE = array.array('i').itemsize
+
+
+def _send_fd(sock, fd, payload):
+    sock.sendmsg([payload], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', [fd]))])
+
+
+def _recv_fd(sock):
+    payload, ancdata, _, _ = sock.recvmsg(_MAX_MESSAGE, socket.CMSG_SPACE(_FD_SIZE))
+    if not payload and not ancdata:
+        raise EndpointClosedException()
+    fds = array.array('i')
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - len(data) % _FD_SIZE])
+    return payload, list(fds)
+
+
+class HandoffServer:
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def setblocking(self, flag):
+        self._sock.setblocking(flag)
+
+    def accept(self):
+        payload, fds = _recv_fd(self._sock)
+        if not fds:
+            raise EndpointClosedException("No descriptor in handoff message")
+        for fd in fds[1:]:
+            os.close(fd)
+        meta = pickle.loads(payload)
+        sock = socket.socket(fileno=fds[0])
+        sock.setblocking(False)
+        return SocketChannel(sock, buffering=meta['buffering']), meta['addr']
+
+    def report(self, stats):
+        try:
+            self._sock.send(str(stats['closed']).encode())
+        except BlockingIOError:
+            pass  # acceptor will get the next report
+
+    def close(self):
+        self._sock.close()
+
+
+class Dispatcher:
+
+    def __init__(self, links):
+        self._links = list(links)
+        self._sent = [0] * len(self._links)
+        self._closed = [0] * len(self._links)
+        for link in self._links:
+            link.setblocking(False)
+
+    @property
+    def loads(self):
+        self._refresh()
+        return [None if closed is None else sent - closed
+                for sent, closed in zip(self._sent, self._closed)]
+
+    def _refresh(self):
+        for i, link in enumerate(self._links):
+            while True:
+                try:
+                    report = link.recv(64)
+                except BlockingIOError:
+                    break
+                if not report:
+                    self._closed[i] = None
+                    break
+                self._closed[i] = int(report)
+
+    def dispatch(self, channel, addr=None):
+        if channel._buffered():
+            raise ValueError("Channel already has buffered data")
+        loads = self.loads
+        payload = pickle.dumps({'buffering': channel.buffering, 'addr': addr})
+        alive = [i for i, closed in enumerate(self._closed) if closed is not None]
+        for i in sorted(alive, key=loads.__getitem__):
+            try:
+                _send_fd(self._links[i], channel.get_fd(), payload)
+            except BlockingIOError:
+                continue
+            self._sent[i] += 1
+            channel.close()
+            return i
+        raise BlockingIOError("No worker can take the connection")
+
+    def close(self):
+        for link in self._links:
+            link.close()
+
+
+def _handoff_worker(conn, link, handler, poller_options):
+    poller = Poller(**poller_options)
+    server = HandoffServer(link)
+    poller.add_server(server)
+    control = PipeChannel(os.dup(conn.fileno()))
+    conn.send(os.getpid())
+    conn.send(_serve(poller, control, handler, server.report))
+    conn.close()
+
+
+class HandoffPool(_WorkerPool):
+
+    def __init__(self, handler, *, workers=None, **poller_options):
+        super().__init__(handler, workers, poller_options)
+        self._dispatcher = None
+
+    def start(self):
+        links = []
+        for _ in range(self._workers):
+            link, child_link = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            self._spawn(_handoff_worker, child_link, self._handler, self._poller_options)
+            child_link.close()
+            links.append(link)
+        self._dispatcher = Dispatcher(links)
+        self._wait_ready()
+
+    @property
+    def loads(self):
+        return self._dispatcher.loads
+
+    def dispatch(self, channel, addr=None):
+        return self._dispatcher.dispatch(channel, addr)
+
+    def _stopped(self):
+        self._dispatcher.close()
+        self._dispatcher = None
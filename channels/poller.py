@@ -1,8 +1,13 @@
+import errno
 import logging
+import os
 import select
 import time
 
-from .channel import EndpointClosedException, SocketChannel
+from collections import deque, namedtuple
+
+from .channel import Channel, EndpointClosedException, LineTooLongException, SocketChannel
+from .timers import TimerWheel
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -10,9 +15,14 @@ _LOGGER = logging.getLogger(__name__)
 _POLLBITS = {
     'POLLIN': select.POLLIN,
     'POLLERR': select.POLLERR,
+    'POLLHUP': select.POLLHUP,
     'POLLOUT': select.POLLOUT,
 }
 
+_REPORTED = select.POLLOUT | select.POLLHUP | select.POLLERR
+
+PollEvent = namedtuple('PollEvent', 'events')
+
 def _event_to_str(event):
     result = []
     for key, val in _POLLBITS.items():
@@ -21,13 +31,116 @@ def _event_to_str(event):
     return "{:b} {}".format(event, '|'.join(result))
 
 
+class _PollBackend:
+
+    def __init__(self):
+        self._poll = select.poll()
+
+    def register(self, fd, events):
+        self._poll.register(fd, events)
+
+    def modify(self, fd, events):
+        self._poll.modify(fd, events)
+
+    def unregister(self, fd):
+        self._poll.unregister(fd)
+
+    def poll(self, timeout):
+        if timeout is not None:
+            timeout = timeout * 1000
+        return self._poll.poll(timeout)
+
+
+class _EpollBackend:
+
+    def __init__(self, edge_triggered=False):
+        self._epoll = select.epoll()
+        self._flags = select.EPOLLET if edge_triggered else 0
+
+    def register(self, fd, events):
+        self._epoll.register(fd, events | self._flags)
+
+    def modify(self, fd, events):
+        self._epoll.modify(fd, events | self._flags)
+
+    def unregister(self, fd):
+        try:
+            self._epoll.unregister(fd)
+        except OSError as ex:
+            # closed descriptors are already gone from epoll set
+            if ex.errno not in (errno.EBADF, errno.ENOENT):
+                raise
+
+    def poll(self, timeout):
+        if timeout is None:
+            timeout = -1
+        return self._epoll.poll(timeout)
+
+    def fileno(self):
+        return self._epoll.fileno()
+
+
+def _make_backend(backend, edge_triggered):
+    if backend == 'auto':
+        backend = 'epoll' if hasattr(select, 'epoll') else 'poll'
+    if backend == 'epoll':
+        return _EpollBackend(edge_triggered)
+    if backend == 'poll':
+        if edge_triggered:
+            raise ValueError("Edge-triggered mode requires epoll backend")
+        return _PollBackend()
+    raise ValueError("Unknown poller backend {!r}".format(backend))
+
+
 class Poller:
 
-    def __init__(self, *, buffering='bytes'):
+    def __init__(self, *, buffering='bytes', backend='poll', edge_triggered=False,
+                 arena_size=None, batch_lines=False, channel_options=None,
+                 accept_limit=64, timer_tick=0.01, idle_timeout=None,
+                 message_budget=None, byte_budget=None,
+                 read_high_watermark=None, read_low_watermark=None):
         self._servers = {}
         self._channels = {}
-        self._poll = select.poll()
+        self._masks = {}
+        self._arenas = {}
+        self._poll = _make_backend(backend, edge_triggered)
         self._buffering = buffering
+        self._edge_triggered = edge_triggered
+        self._arena_size = arena_size
+        self._batch_lines = batch_lines
+        self._channel_options = channel_options or {}
+        self._accept_limit = accept_limit
+        self._backlogged = set()
+        self._pending = {}
+        self._carried = {}
+        self._message_budget = message_budget
+        self._byte_budget = byte_budget
+        self._read_high_watermark = read_high_watermark
+        if read_low_watermark is None and read_high_watermark is not None:
+            read_low_watermark = read_high_watermark // 4
+        self._read_low_watermark = read_low_watermark
+        self._paused = set()
+        self._overloaded = set()
+        self._queue_depths = {}
+        self._interest = {}
+        self._forwards = {}
+        self._forward_sources = {}
+        self._blocked = set()
+        self._checks = {}
+        self._unflushed = {}
+        self._flush_timers = {}
+        self._internal = {}
+        self._running = False
+        self._wakeup = None
+        self._completed = deque()
+        self._tasks = {}
+        self._timers = TimerWheel(tick=timer_tick)
+        self._idle_timeout = idle_timeout
+        if idle_timeout is not None:
+            self._bucket_width = idle_timeout / 4
+        self._activity = {}
+        self._idle_buckets = {}
+        self._unreaped = set()
 
     @staticmethod
     def _readlines(channel):
@@ -37,38 +150,614 @@ class Poller:
                 break
             yield data
 
-    def poll(self, timeout=None):
-        if timeout is not None:
-            timeout = timeout * 1000
-        result = []
-        for fd, event in self._poll.poll(timeout):
-            _LOGGER.debug("Got event %s on fd %d", _event_to_str(event), fd)
-            if fd in self._channels:
-                channel = self._channels[fd]
+    @staticmethod
+    def _readframes(channel):
+        while True:
+            data = channel._get_frame()
+            if data is None:
+                if not channel._read_into_buffer():
+                    break
+            elif data:
+                yield data
+
+    @staticmethod
+    def _buffered_messages(channel):
+        if channel.buffering == 'frame':
+            while True:
+                data = channel._get_frame()
+                if data is None:
+                    break
+                if data:
+                    yield data
+        else:
+            while channel._line_ready():
+                yield channel._get_first_line()
+
+    def _over_budget(self, count, size):
+        return (self._message_budget is not None and count >= self._message_budget
+                or self._byte_budget is not None and size >= self._byte_budget)
+
+    def _budgeted(self, messages, channel, fd):
+        count = size = 0
+        for data in messages:
+            yield data, channel
+            count += 1
+            size += len(data)
+            if self._over_budget(count, size) and channel._buffered():
+                self._carried[fd] = select.POLLIN
+                return
+
+    @staticmethod
+    def _drain(channel):
+        while channel._read_into_buffer():
+            if channel._tail_too_long():
+                break  # the next read reports and discards the line
+
+    def _read_all(self, channel, fd):
+        chunks = []
+        size = 0
+        try:
+            while True:
+                data = channel.read()
+                if not data:
+                    break
+                chunks.append(data)
+                size += len(data)
+                if self._over_budget(0, size):
+                    self._carried[fd] = select.POLLIN
+                    break
+        except EndpointClosedException:
+            if chunks:
+                yield b''.join(chunks), channel
+            raise
+        if chunks:
+            yield b''.join(chunks), channel
+
+    def _read_line_batch(self, channel, fd, buffered_only):
+        lines = []
+        size = 0
+        try:
+            while True:
+                if buffered_only:
+                    batch = channel._split_lines()
+                else:
+                    batch = channel.readlines()
+                if not batch:
+                    break
+                lines.extend(batch)
+                size += sum(map(len, batch))
+                if self._over_budget(len(lines), size):
+                    if channel._buffered():
+                        self._carried[fd] = select.POLLIN
+                    break
+        except (EndpointClosedException, LineTooLongException):
+            if lines:
+                yield lines, channel
+            raise
+        if lines:
+            yield lines, channel
+
+    def _read_arena(self, channel, fd):
+        arena = self._arenas.get(fd)
+        if arena is None:
+            arena = self._arenas[fd] = memoryview(bytearray(self._arena_size))
+        size = 0
+        try:
+            while size < len(arena):
+                count = channel.read_into(arena[size:])
+                size += count
+                if not count or not self._edge_triggered:
+                    break
+        except EndpointClosedException:
+            if size:
+                yield arena[:size], channel
+            raise
+        if size or not self._edge_triggered:
+            yield arena[:size], channel
+        if self._edge_triggered and size == len(arena):
+            yield from self._read_all(channel, fd)
+
+    def _read_datagrams(self, channel, fd):
+        count = size = 0
+        while True:
+            batch = channel.read()
+            if not batch:
+                return
+            yield batch, channel
+            if not self._edge_triggered:
+                return
+            count += len(batch)
+            size += sum(len(payload) for payload, _ in batch)
+            if self._over_budget(count, size):
+                self._carried[fd] = select.POLLIN
+                return
+
+    def _read_channel(self, channel, fd, buffered_only=False):
+        if channel.buffering == 'datagram':
+            yield from self._read_datagrams(channel, fd)
+        elif channel.buffering in ('line', 'frame'):
+            batch = self._batch_lines and channel.buffering == 'line'
+            if buffered_only and not batch:
+                yield from self._budgeted(self._buffered_messages(channel), channel, fd)
+                return
+            if self._edge_triggered and not buffered_only:
                 try:
-                    if channel.buffering == 'line':
-                        for data in self._readlines(channel):
-                            result.append((data, channel))
-                    else:
-                        result.append((channel.read(), channel))
+                    self._drain(channel)
                 except EndpointClosedException:
-                    result.append((b'', channel))
-                    self._unregister(channel, fd)
-            elif event & select.POLLIN:
-                server = self._servers[fd]
+                    pass
+            if batch:
+                yield from self._read_line_batch(channel, fd, buffered_only)
+                return
+            if channel.buffering == 'frame':
+                messages = self._readframes(channel)
+            else:
+                messages = self._readlines(channel)
+            yield from self._budgeted(messages, channel, fd)
+        elif self._arena_size:
+            yield from self._read_arena(channel, fd)
+        elif self._edge_triggered:
+            yield from self._read_all(channel, fd)
+        else:
+            yield channel.read(), channel
+
+    def _accept(self, server):
+        if self._edge_triggered:
+            self._backlogged.add(server)
+        for _ in range(self._accept_limit):
+            try:
                 sock, addr = server.accept()
-                client = SocketChannel(sock, buffering=self._buffering)
-                self.register(client)
-                result.append(((addr, client), server))
-        return result
+            except BlockingIOError:
+                self._backlogged.discard(server)
+                return
+            if isinstance(sock, Channel):
+                client = sock
+            else:
+                sock.setblocking(False)
+                client = SocketChannel(sock, buffering=self._buffering,
+                                       **self._channel_options)
+            self.register(client)
+            yield (addr, client), server
+
+    def fileno(self):
+        try:
+            return self._poll.fileno()
+        except AttributeError:
+            raise NotImplementedError("Only epoll backend has a file descriptor")
+
+    def time(self):
+        return self._timers.time()
+
+    def call_at(self, when, callback, *args):
+        return self._timers.call_at(when, callback, *args)
+
+    def call_later(self, delay, callback, *args):
+        return self._timers.call_later(delay, callback, *args)
+
+    def _touch(self, fd, now):
+        bucket = int(now // self._bucket_width)
+        old = self._activity.get(fd)
+        if old == bucket:
+            return
+        if old is not None:
+            self._forget(fd)
+        self._activity[fd] = bucket
+        self._idle_buckets.setdefault(bucket, set()).add(fd)
+
+    def _reaped(self, fd):
+        # paused channels get no events, they are not idle
+        return (self._idle_timeout is not None and fd not in self._unreaped
+                and fd not in self._paused and fd not in self._overloaded)
+
+    def _track_idle(self, fd):
+        if self._reaped(fd):
+            self._touch(fd, self._timers.time())
+        else:
+            self._forget(fd)
+
+    def _held(self, fd):
+        # an overload from the buffer is only drained by serving it
+        return fd in self._paused or (fd in self._overloaded and
+                                      self._queue_depths.get(fd, 0) > self._read_low_watermark)
+
+    def _forget(self, fd):
+        bucket = self._activity.pop(fd, None)
+        if bucket is None:
+            return
+        fds = self._idle_buckets[bucket]
+        fds.discard(fd)
+        if not fds:
+            del self._idle_buckets[bucket]
+
+    def _next_reap(self):
+        if not self._idle_buckets:
+            return None
+        return (min(self._idle_buckets) + 1) * self._bucket_width + self._idle_timeout
 
-    def register(self, channel):
+    def _reap(self, now):
+        limit = int((now - self._idle_timeout) // self._bucket_width)
+        for bucket in sorted(b for b in self._idle_buckets if b < limit):
+            for fd in list(self._idle_buckets.get(bucket, ())):
+                channel = self._channels[fd]
+                _LOGGER.debug("Channel %s with fd %d is idle", channel, fd)
+                self._unregister(channel, fd)
+                channel.close()
+                yield b'', channel
+
+    def _timeout(self, timeout):
+        deadline = self._timers.next_deadline()
+        if self._idle_timeout is not None:
+            reap = self._next_reap()
+            if deadline is None or reap is not None and reap < deadline:
+                deadline = reap
+        if deadline is None:
+            return timeout
+        wait = max(deadline - self._timers.time(), 0)
+        if timeout is None or wait < timeout:
+            return wait
+        return timeout
+
+    def _channel_events(self, channel, fd, event, now, buffered_only):
+        if self._reaped(fd):
+            self._touch(fd, now)
+        interest = self._interest[fd]
+        try:
+            if event & select.POLLOUT:
+                channel.flush()
+            reported = event & interest & _REPORTED
+            if reported:
+                yield PollEvent(reported), channel
+            if event & ~select.POLLOUT == 0:
+                return
+            if reported & ~select.POLLOUT and not interest & select.POLLIN:
+                return
+            if fd in self._forwards:
+                self._forward(channel, fd)
+                self._wake_unread(channel, fd)
+                return
+            while True:
+                try:
+                    yield from self._read_channel(channel, fd, buffered_only)
+                    break
+                except LineTooLongException as ex:
+                    yield ex, channel
+            if self._read_high_watermark is not None:
+                self._check_load(channel, fd)
+            self._wake_unread(channel, fd)
+        except EndpointClosedException:
+            self._unregister(channel, fd)
+            yield b'', channel
+
+    def _events(self, fd, event, now, buffered_only=False):
+        _LOGGER.debug("Got event %s on fd %d", _event_to_str(event), fd)
+        if fd in self._channels:
+            yield from self._channel_events(self._channels[fd], fd, event, now,
+                                            buffered_only)
+        elif fd in self._internal:
+            self._internal[fd]()
+        elif event & select.POLLIN and fd in self._servers:
+            # the caller might have unregistered it since the poll
+            server = self._servers[fd]
+            if server not in self._backlogged:
+                yield from self._accept(server)
+
+    def _postpone(self, fd, queue):
+        channel = self._channels.get(fd)
+        if channel is not None and (self._edge_triggered or channel._buffered()):
+            self._pending[fd] = select.POLLIN
+        for fd, event in queue:
+            if fd in self._channels or fd in self._servers or fd in self._internal:
+                self._pending[fd] = self._pending.get(fd, 0) | event
+
+    def iter_events(self, timeout=None):
+        self._flush_unflushed()
+        timeout = self._timeout(timeout)
+        pending, self._pending = self._pending, {}
+        carried, self._carried = self._carried, {}
+        for fd in [fd for fd in carried if self._held(fd)]:
+            self._carried[fd] = carried.pop(fd)
+        backlogged = list(self._backlogged)
+        if pending or carried or backlogged:
+            timeout = 0
+        for server in backlogged:
+            yield from self._accept(server)
+        events = self._poll.poll(timeout)
+        now = self._timers.time()
+        for fd, event in events:
+            if fd in carried:
+                carried[fd] |= event
+            else:
+                pending[fd] = pending.get(fd, 0) | event
+        buffered_only = set()
+        if self._edge_triggered:
+            buffered_only.update(fd for fd in carried if not self._masks[fd] & select.POLLIN)
+        else:
+            buffered_only.update(carried)
+            buffered_only.difference_update(fd for fd, _ in events)
+        for fd, event in carried.items():
+            pending[fd] = pending.get(fd, 0) | event
+        queue = deque(pending.items())
+        fd = None
+        try:
+            while queue:
+                fd, event = queue.popleft()
+                yield from self._events(fd, event, now, fd in buffered_only)
+            fd = None
+        finally:
+            if fd is not None:
+                self._postpone(fd, queue)
+        self._flush_unflushed()
+        if self._idle_timeout is not None:
+            yield from self._reap(now)
+        self._timers.run_expired()
+
+    def poll(self, timeout=None):
+        return list(self.iter_events(timeout))
+
+    def _drain_wakeup(self):
+        try:
+            while os.read(self._wakeup[0], 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _wake(self):
+        wakeup = self._wakeup
+        if wakeup is None:
+            return
+        try:
+            os.write(wakeup[1], b'\0')
+        except BlockingIOError:
+            pass  # already woken up
+
+    def _open_wakeup(self):
+        self._wakeup = os.pipe()
+        for fd in self._wakeup:
+            os.set_blocking(fd, False)
+        self._internal[self._wakeup[0]] = self._drain_wakeup
+        self._poll.register(self._wakeup[0], select.POLLIN)
+
+    def _close_wakeup(self):
+        fd = self._wakeup[0]
+        self._poll.unregister(fd)
+        del self._internal[fd]
+        for fd in self._wakeup:
+            os.close(fd)
+        self._wakeup = None
+
+    def _reply(self, channel, reply):
+        if reply is None:
+            return
+        try:
+            channel.write(reply)
+        except EndpointClosedException:
+            _LOGGER.debug("Channel %s closed before reply was written", channel)
+
+    def _submit(self, executor, on_data, channel, data):
+        pending = self._tasks.get(channel)
+        if pending is not None:
+            pending.append(data)
+            return
+        self._tasks[channel] = deque()
+        self._start_task(executor, on_data, channel, data)
+
+    def _start_task(self, executor, on_data, channel, data):
+        def done(future):
+            self._completed.append((channel, future))
+            self._wake()
+        executor.submit(on_data, data).add_done_callback(done)
+
+    def _process_completed(self, executor, on_data):
+        while self._completed:
+            channel, future = self._completed.popleft()
+            try:
+                self._reply(channel, future.result())
+            except Exception:
+                _LOGGER.exception("Handler failed for channel %s", channel)
+            pending = self._tasks[channel]
+            if pending:
+                self._start_task(executor, on_data, channel, pending.popleft())
+            else:
+                del self._tasks[channel]
+
+    def _dispatch(self, data, channel, on_data, on_accept, on_close, on_event,
+                  executor):
+        if not isinstance(channel, Channel):
+            addr, client = data
+            if on_accept is not None:
+                on_accept(client, addr)
+        elif isinstance(data, PollEvent):
+            if on_event is not None:
+                on_event(channel, data.events)
+        elif isinstance(data, Exception):
+            _LOGGER.warning("Error on channel %s: %s", channel, data)
+        elif not data:
+            if on_close is not None:
+                on_close(channel)
+        elif executor is None:
+            self._reply(channel, on_data(data))
+        else:
+            if isinstance(data, memoryview):
+                data = bytes(data)  # the buffer is reused by the next read
+            self._submit(executor, on_data, channel, data)
+
+    def run(self, on_data, on_accept=None, on_close=None, executor=None,
+            on_event=None):
+        self._running = True
+        self._open_wakeup()
+        try:
+            while self._running:
+                for data, channel in self.iter_events():
+                    self._dispatch(data, channel, on_data, on_accept, on_close,
+                                   on_event, executor)
+                if executor is not None:
+                    self._process_completed(executor, on_data)
+        finally:
+            self._close_wakeup()
+
+    def stop(self):
+        self._running = False
+        if self._wakeup is not None:
+            self._wake()
+
+    def register(self, channel, events=select.POLLIN, *, reap=True):
         fd = channel.get_fd()
         self._channels[fd] = channel
-        self._poll.register(fd, select.POLLIN)
+        self._interest[fd] = events
+        self._masks[fd] = self._channel_mask(channel, fd)
+        self._poll.register(fd, self._masks[fd])
+        channel._write_listener = self._update_mask
+        if not reap:
+            self._unreaped.add(fd)
+        self._track_idle(fd)
+        if channel._input_pending():
+            self._pending[fd] = select.POLLIN
+        if channel._poll_interval is not None:
+            self._schedule_check(channel, fd)
+        if channel._corked:
+            self._defer_flush(channel, fd)
         _LOGGER.debug("Registered channel %s with fd %d", channel, fd)
 
+    def _schedule_check(self, channel, fd):
+        def check():
+            channel._check()
+            self._schedule_check(channel, fd)
+        self._checks[fd] = self.call_later(channel._poll_interval, check)
+
+    def _channel_mask(self, channel, fd):
+        mask = self._interest[fd]
+        if fd in self._paused or fd in self._overloaded or fd in self._blocked:
+            mask &= ~select.POLLIN
+        if channel.write_buffer_size and not channel._corked:
+            mask |= select.POLLOUT
+        return mask
+
+    def modify(self, channel, events):
+        fd = channel.get_fd()
+        if fd not in self._channels:
+            raise KeyError("Channel {} is not registered".format(channel))
+        self._interest[fd] = events
+        self._update_mask(channel)
+
+    def _update_mask(self, channel):
+        fd = channel.get_fd()
+        if fd not in self._channels:
+            return
+        if channel._corked:
+            self._defer_flush(channel, fd)
+        mask = self._channel_mask(channel, fd)
+        if mask != self._masks[fd]:
+            self._masks[fd] = mask
+            self._poll.modify(fd, mask)
+            self._wake_unread(channel, fd)
+        if not channel.write_buffer_size:
+            for source in self._forward_sources.get(fd, ()):
+                if source in self._blocked:
+                    self._blocked.discard(source)
+                    self._update_mask(self._channels[source])
+
+    def _wake_unread(self, channel, fd):
+        if self._masks[fd] & select.POLLIN and channel._more_input():
+            self._pending[fd] = self._pending.get(fd, 0) | select.POLLIN
+
+    def _defer_flush(self, channel, fd):
+        interval = channel._flush_interval
+        if interval is None:
+            self._unflushed[fd] = channel
+        elif fd not in self._flush_timers:
+            self._flush_timers[fd] = self.call_later(interval, self._timed_flush, channel, fd)
+
+    def _timed_flush(self, channel, fd):
+        del self._flush_timers[fd]
+        self._flush_channel(channel)
+
+    @staticmethod
+    def _flush_channel(channel):
+        try:
+            channel.flush()
+        except EndpointClosedException:
+            pass  # reported when the channel is read
+
+    def _flush_unflushed(self):
+        unflushed, self._unflushed = self._unflushed, {}
+        for channel in unflushed.values():
+            self._flush_channel(channel)
+
+    def _forward(self, channel, fd):
+        target, _, max_bytes = self._forwards[fd]
+        while channel.forward_to(target, max_bytes) and self._edge_triggered:
+            pass
+        if target.write_buffer_size:
+            self._blocked.add(fd)
+            self._update_mask(channel)
+
+    def _stop_forwarding(self, fd):
+        _, target_fd, _ = self._forwards.pop(fd)
+        sources = self._forward_sources[target_fd]
+        sources.discard(fd)
+        if not sources:
+            del self._forward_sources[target_fd]
+        self._blocked.discard(fd)
+
+    def forward(self, source, target, max_bytes=65536):
+        fd = source.get_fd()
+        if fd not in self._channels:
+            raise KeyError("Channel {} is not registered".format(source))
+        if fd in self._forwards:
+            self._stop_forwarding(fd)
+        if target is not None:
+            target_fd = target.get_fd()
+            if target_fd not in self._channels:
+                raise KeyError("Channel {} is not registered".format(target))
+            self._forwards[fd] = target, target_fd, max_bytes
+            self._forward_sources.setdefault(target_fd, set()).add(fd)
+        self._update_mask(source)
+
+    @staticmethod
+    def _undelivered(channel):
+        # a partial message only grows until the rest of it is read
+        if channel.buffering == 'line' and not channel._lf:
+            return 0
+        if channel.buffering == 'frame' and not channel._frame_ready():
+            return 0
+        return channel._buffered()
+
+    def _check_load(self, channel, fd):
+        load = max(self._undelivered(channel), self._queue_depths.get(fd, 0))
+        if load > self._read_high_watermark:
+            if fd not in self._overloaded:
+                _LOGGER.debug("Channel %s with fd %d is overloaded", channel, fd)
+                self._overloaded.add(fd)
+                self._forget(fd)
+                self._update_mask(channel)
+        elif load <= self._read_low_watermark and fd in self._overloaded:
+            self._overloaded.discard(fd)
+            self._track_idle(fd)
+            self._update_mask(channel)
+
+    def pause(self, channel):
+        fd = channel.get_fd()
+        if fd in self._channels:
+            self._paused.add(fd)
+            self._forget(fd)
+            self._update_mask(channel)
+
+    def resume(self, channel):
+        fd = channel.get_fd()
+        if fd in self._channels:
+            self._paused.discard(fd)
+            self._track_idle(fd)
+            self._update_mask(channel)
+
+    def report_queue_depth(self, channel, depth):
+        fd = channel.get_fd()
+        if fd not in self._channels:
+            return
+        self._queue_depths[fd] = depth
+        if self._read_high_watermark is not None:
+            self._check_load(channel, fd)
+
     def add_server(self, server):
+        server.setblocking(False)
         self._servers[server.fileno()] = server
         self._poll.register(server.fileno(), select.POLLIN)
 
@@ -77,12 +766,37 @@ class Poller:
             channel.close()
         for server in self._servers.values():
             server.close()
+        self._backlogged.clear()
 
     def _unregister(self, channel, fd):
         if fd not in self._channels:
             return
         self._poll.unregister(fd)
         del self._channels[fd]
+        del self._masks[fd]
+        self._arenas.pop(fd, None)
+        self._forget(fd)
+        self._unreaped.discard(fd)
+        self._pending.pop(fd, None)
+        self._carried.pop(fd, None)
+        self._paused.discard(fd)
+        self._overloaded.discard(fd)
+        self._queue_depths.pop(fd, None)
+        del self._interest[fd]
+        check = self._checks.pop(fd, None)
+        if check is not None:
+            check.cancel()
+        self._unflushed.pop(fd, None)
+        flush = self._flush_timers.pop(fd, None)
+        if flush is not None:
+            flush.cancel()
+        if fd in self._forwards:
+            self._stop_forwarding(fd)
+        for source in self._forward_sources.pop(fd, ()):
+            del self._forwards[source]
+            self._blocked.discard(source)
+            self._update_mask(self._channels[source])
+        channel._write_listener = None
         _LOGGER.debug("Unregistered channel %s with fd %d", channel, fd)
 
     def unregister(self, channel):
@@ -0,0 +1,238 @@
+import os
+import select
+import struct
+
+from multiprocessing import shared_memory
+
+from .channel import Channel, EndpointClosedException, _advance
+
+
+# head, tail and flags live on separate cache lines
+_HEAD = 0
+_TAIL = 64
+_WRITER_CLOSED = 128
+_READER_CLOSED = 129
+_WAITING = 130
+_DATA = 192
+
+_POSITION = struct.Struct('Q')
+
+
+class _Doorbell:
+
+    def __init__(self):
+        if hasattr(os, 'eventfd'):
+            self._r = self._w = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        else: #pragma: no cover
+            self._r, self._w = os.pipe()
+            for fd in (self._r, self._w):
+                os.set_blocking(fd, False)
+
+    def fileno(self):
+        return self._r
+
+    def ring(self):
+        try:
+            os.write(self._w, _POSITION.pack(1))
+        except BlockingIOError:
+            pass  # already ringing
+
+    def clear(self):
+        try:
+            # a single read resets an eventfd
+            while len(os.read(self._r, 4096)) == 4096:
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self):
+        select.select([self._r], [], [])
+        self.clear()
+
+    def close(self):
+        os.close(self._r)
+        if self._w != self._r:
+            os.close(self._w)
+
+
+class _Ring:
+
+    def __init__(self, capacity):
+        self._shm = shared_memory.SharedMemory(create=True, size=_DATA + capacity)
+        # both ends are shared by fork, the name is not needed
+        self._shm.unlink()
+        # no slices of the buffer are kept, it would not be closed with them
+        self._buf = self._shm.buf
+        self._capacity = capacity
+        self._users = 2
+        self.data_bell = _Doorbell()
+        self.space_bell = _Doorbell()
+
+    def _get(self, offset):
+        return _POSITION.unpack_from(self._buf, offset)[0]
+
+    def _set(self, offset, value):
+        _POSITION.pack_into(self._buf, offset, value)
+
+    @property
+    def writer_closed(self):
+        return self._buf[_WRITER_CLOSED]
+
+    @property
+    def reader_closed(self):
+        return self._buf[_READER_CLOSED]
+
+    def used(self):
+        return self._get(_TAIL) - self._get(_HEAD)
+
+    def put(self, chunks):
+        tail = self._get(_TAIL)
+        free = self._capacity - (tail - self._get(_HEAD))
+        total = 0
+        for chunk in chunks:
+            chunk = memoryview(chunk)
+            count = min(len(chunk), free - total)
+            start = _DATA + (tail + total) % self._capacity
+            first = min(count, _DATA + self._capacity - start)
+            self._buf[start:start+first] = chunk[:first]
+            self._buf[_DATA:_DATA+count-first] = chunk[first:count]
+            total += count
+            if count < len(chunk):
+                break
+        if total:
+            self._set(_TAIL, tail + total)
+            # ring only on the empty to non-empty transition,
+            # head is checked after the tail is published
+            if self._get(_HEAD) == tail:
+                self.data_bell.ring()
+        return total
+
+    def _consume(self, head, count):
+        self._set(_HEAD, head + count)
+        if self._buf[_WAITING]:
+            self._buf[_WAITING] = 0
+            self.space_bell.ring()
+
+    def get(self, size):
+        head = self._get(_HEAD)
+        count = min(size, self._get(_TAIL) - head)
+        if not count:
+            return b''
+        start = _DATA + head % self._capacity
+        first = min(count, _DATA + self._capacity - start)
+        data = bytes(self._buf[start:start+first])
+        if first < count:
+            data += self._buf[_DATA:_DATA+count-first]
+        self._consume(head, count)
+        return data
+
+    def get_into(self, buf):
+        head = self._get(_HEAD)
+        count = min(len(buf), self._get(_TAIL) - head)
+        if not count:
+            return 0
+        start = _DATA + head % self._capacity
+        first = min(count, _DATA + self._capacity - start)
+        buf[:first] = self._buf[start:start+first]
+        buf[first:count] = self._buf[_DATA:_DATA+count-first]
+        self._consume(head, count)
+        return count
+
+    def wait_for_space(self):
+        self._buf[_WAITING] = 1
+        # the consumer might have freed space before seeing the flag
+        if self.used() < self._capacity:
+            self._buf[_WAITING] = 0
+            return
+        self.space_bell.wait()
+
+    def close_writer(self):
+        self._buf[_WRITER_CLOSED] = 1
+        self.data_bell.ring()
+
+    def close_reader(self):
+        self._buf[_READER_CLOSED] = 1
+        self.space_bell.ring()
+
+    def release(self):
+        self._users -= 1
+        if self._users:
+            return
+        self._buf = None
+        self._shm.close()
+        self.data_bell.close()
+        self.space_bell.close()
+
+
+class SharedMemoryChannel(Channel):
+
+    _default_read_size = 65536
+
+    def __init__(self, inbound, outbound, **kwargs):
+        super().__init__(**kwargs)
+        self._inbound = inbound
+        self._outbound = outbound
+        self._closed = False
+
+    @classmethod
+    def pair(cls, size=1048576, **kwargs):
+        first, second = _Ring(size), _Ring(size)
+        return cls(first, second, **kwargs), cls(second, first, **kwargs)
+
+    def _receive(self, get, arg):
+        if self._closed:
+            raise EndpointClosedException()
+        ring = self._inbound
+        result = get(arg)
+        if not result and ring.writer_closed:
+            result = get(arg)  # written right before closing
+            if not result:
+                raise EndpointClosedException()
+        if not ring.used():
+            ring.data_bell.clear()
+            # the producer only rings for an empty ring, check again after clearing
+            if ring.used() or ring.writer_closed:
+                ring.data_bell.ring()
+        return result
+
+    def _read_chunk(self, size):
+        return self._receive(self._inbound.get, size)
+
+    def _read_into(self, buf):
+        if not len(buf):
+            return 0
+        return self._receive(self._inbound.get_into, buf)
+
+    def _sendv(self, chunks):
+        if self._closed or self._outbound.reader_closed:
+            raise EndpointClosedException()
+        return self._outbound.put(chunks)
+
+    def write(self, *data):
+        total = 0
+        chunks = [d for d in data if d]
+        # like a blocking pipe, waits while the ring is full
+        while chunks:
+            written = self._writev(chunks)
+            total += written
+            chunks = _advance(chunks, written)
+            if chunks:
+                self._outbound.wait_for_space()
+        return total
+
+    def detach(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._outbound.release()
+        self._inbound.release()
+
+    def close(self):
+        if self._closed:
+            return
+        self._outbound.close_writer()
+        self._inbound.close_reader()
+        self.detach()
+
+    def get_fd(self):
+        return self._inbound.data_bell.fileno()
@@ -0,0 +1,112 @@
+import logging
+import time
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Timer:
+
+    __slots__ = ('deadline', '_callback', '_args', '_slot', '_wheel')
+
+    def __init__(self, deadline, callback, args, slot, wheel):
+        self.deadline = deadline
+        self._callback = callback
+        self._args = args
+        self._slot = slot
+        self._wheel = wheel
+
+    @property
+    def cancelled(self):
+        return self._slot is None
+
+    def cancel(self):
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+            self._wheel._live -= 1
+
+    def _run(self):
+        try:
+            self._callback(*self._args)
+        except Exception:
+            _LOGGER.exception("Timer callback %r failed", self._callback)
+
+
+class TimerWheel:
+
+    def __init__(self, *, tick=0.01, size=512, clock=time.monotonic):
+        self._tick = tick
+        self._slots = [{} for _ in range(size)]
+        self._clock = clock
+        # Every tick up to this one has been checked already
+        self._checked = self._tick_of(clock()) - 1
+        self._live = 0
+        # No timer is due before this tick, adding a timer can only lower it
+        self._next_tick = self._checked + 1
+
+    def _tick_of(self, when):
+        return int(when // self._tick)
+
+    def time(self):
+        return self._clock()
+
+    def call_at(self, when, callback, *args):
+        tick = max(self._tick_of(when), self._checked + 1)
+        slot = self._slots[tick % len(self._slots)]
+        timer = Timer(when, callback, args, slot, self)
+        slot[timer] = None
+        self._live += 1
+        self._next_tick = min(self._next_tick, tick)
+        return timer
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self._clock() + delay, callback, *args)
+
+    def __len__(self):
+        return self._live
+
+    def next_deadline(self):
+        if not self._live:
+            return None
+        size = len(self._slots)
+        first = self._checked + 1
+        for tick in range(max(self._next_tick, first), first + size):
+            slot = self._slots[tick % size]
+            if not slot:
+                continue
+            due = [timer.deadline for timer in slot
+                   if self._tick_of(timer.deadline) <= tick]
+            if due:
+                self._next_tick = tick
+                return min(due)
+        # Only timers more than a full turn ahead are left, look again then
+        self._next_tick = max(self._next_tick, first + size)
+        return self._next_tick * self._tick
+
+    def expire(self, now=None):
+        if now is None:
+            now = self._clock()
+        size = len(self._slots)
+        current = self._tick_of(now)
+        deadline = self.next_deadline()
+        if deadline is None or deadline > now:
+            self._checked = max(self._checked, current - 1)
+            return []
+        first = max(self._checked + 1, current - size + 1)
+        result = []
+        for tick in range(first, current + 1):
+            slot = self._slots[tick % size]
+            for timer in [timer for timer in slot if timer.deadline <= now]:
+                timer.cancel()
+                result.append(timer)
+        # The current tick may still get timers due later during it
+        self._checked = max(self._checked, current - 1)
+        result.sort(key=lambda timer: timer.deadline)
+        return result
+
+    def run_expired(self, now=None):
+        expired = self.expire(now)
+        for timer in expired:
+            timer._run()
+        return len(expired)
@@ -0,0 +1,139 @@
+import asyncio
+import socket
+import unittest
+
+from channels import EndpointClosedException, SocketChannel
+from channels.aio import AsyncChannel, AsyncPoller
+
+
+class AsyncChannelTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self.addCleanup(self._client.close)
+
+    def _run(self, coro):
+        return asyncio.run(asyncio.wait_for(coro, 5))
+
+    def test_read(self):
+        async def main():
+            chan = AsyncChannel(SocketChannel(self._client))
+            asyncio.get_running_loop().call_later(
+                0.01, self._server.send, b'hello')
+            return await chan.read()
+
+        self.assertEqual(self._run(main()), b'hello')
+
+    def test_readline(self):
+        async def main():
+            chan = AsyncChannel(SocketChannel(self._client))
+            self._server.send(b'hel')
+            asyncio.get_running_loop().call_later(
+                0.01, self._server.send, b'lo\nworld\n')
+            return [await chan.readline(), await chan.readline()]
+
+        self.assertEqual(self._run(main()), [b'hello\n', b'world\n'])
+
+    def test_iterate_lines(self):
+        async def main():
+            chan = AsyncChannel(SocketChannel(self._client,
+                                              buffering='line'))
+            self._server.send(b'a\nb\nc')
+            self._server.close()
+            return [line async for line in chan]
+
+        self.assertEqual(self._run(main()), [b'a\n', b'b\n', b'c'])
+
+    def test_read_closed(self):
+        async def main():
+            chan = AsyncChannel(SocketChannel(self._client))
+            self._server.close()
+            await chan.read()
+
+        with self.assertRaises(EndpointClosedException):
+            self._run(main())
+
+    def test_drain(self):
+        self._client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        data = b'x' * (1 << 20)
+        received = bytearray()
+
+        def consume():
+            try:
+                while True:
+                    chunk = self._server.recv(65536)
+                    if not chunk:
+                        return
+                    received.extend(chunk)
+            except BlockingIOError:
+                pass
+
+        async def main():
+            self._server.setblocking(False)
+            loop = asyncio.get_running_loop()
+            loop.add_reader(self._server.fileno(), consume)
+            chan = AsyncChannel(SocketChannel(self._client))
+            chan.write(data)
+            self.assertTrue(chan.channel.write_paused)
+            await chan.drain()
+            self.assertFalse(chan.channel.write_paused)
+            while len(received) < len(data):
+                await asyncio.sleep(0.01)
+            loop.remove_reader(self._server.fileno())
+            return chan.channel.write_buffer_size
+
+        self.assertEqual(self._run(main()), 0)
+        self.assertEqual(bytes(received), data)
+
+
+class AsyncPollerTest(unittest.TestCase):
+
+    def test_poll(self):
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+
+        async def main():
+            poller = AsyncPoller(buffering='line')
+            chan = SocketChannel(client, buffering='line')
+            poller.register(chan)
+            asyncio.get_running_loop().call_later(
+                0.01, server.send, b'hello\n')
+            result = await poller.poll()
+            return result, chan
+
+        result, chan = asyncio.run(asyncio.wait_for(main(), 5))
+        self.assertEqual(result, [(b'hello\n', chan)])
+
+    def test_poll_timeout(self):
+        async def main():
+            return await AsyncPoller().poll(0.01)
+
+        self.assertEqual(asyncio.run(main()), [])
+
+    def test_poller_timers(self):
+        fired = []
+
+        async def main():
+            poller = AsyncPoller()
+            poller.poller.call_later(0.01, fired.append, 'timer')
+            while not fired:
+                await poller.poll(1)
+
+        asyncio.run(asyncio.wait_for(main(), 0.5))
+        self.assertEqual(fired, ['timer'])
+
+    def test_iterate(self):
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+
+        async def main():
+            poller = AsyncPoller()
+            poller.register(SocketChannel(client))
+            server.send(b'hi')
+            async for result in poller:
+                return [data for data, _ in result]
+
+        self.assertEqual(asyncio.run(asyncio.wait_for(main(), 5)), [b'hi'])
@@ -0,0 +1,130 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from channels import DatagramChannel
+from channels.poller import Poller
+
+from utils import timeout
+
+
+class DatagramChannelTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._server.bind(('127.0.0.1', 0))
+        self.addCleanup(self._server.close)
+        self._client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._client.bind(('127.0.0.1', 0))
+        self.addCleanup(self._client.close)
+        self._channel = DatagramChannel(self._server)
+
+    def test_read(self):
+        self.assertEqual(self._channel.read(), [])
+
+        address = self._server.getsockname()
+        self._client.sendto(b'hello', address)
+        self._client.sendto(b'', address)
+        self._client.sendto(b'world', address)
+
+        client = self._client.getsockname()
+        self.assertEqual(self._channel.read(), [(b'hello', client),
+                                                (b'', client),
+                                                (b'world', client)])
+        self.assertEqual(self._channel.read(), [])
+
+    def test_batch_size(self):
+        channel = DatagramChannel(self._server, batch_size=2)
+        for i in range(3):
+            self._client.sendto(bytes([i]), self._server.getsockname())
+
+        self.assertEqual(len(channel.read()), 2)
+        self.assertEqual(len(channel.read()), 1)
+
+    def test_write(self):
+        self._client.connect(self._server.getsockname())
+        channel = DatagramChannel(self._client)
+
+        self.assertEqual(channel.write(b'hello, ', b'world'), 12)
+        self.assertEqual(channel.sendto(b'again', self._server.getsockname()), 5)
+
+        self.assertEqual(self._server.recv(100), b'hello, world')
+        self.assertEqual(self._server.recv(100), b'again')
+
+    def test_buffering(self):
+        with self.assertRaises(ValueError):
+            DatagramChannel(self._server, buffering='line')
+
+    def test_stream_options(self):
+        for option in ('write_buffering', 'delimiter', 'read_budget'):
+            with self.subTest(option=option), self.assertRaises(TypeError):
+                DatagramChannel(self._server, **{option: 1})
+
+    def test_buffering_property(self):
+        self.assertEqual(self._channel.buffering, 'datagram')
+
+    def test_unix(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        server.bind(path)
+        self.addCleanup(server.close)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(client.close)
+
+        client.sendto(b'hello', path)
+
+        self.assertEqual([payload for payload, _ in DatagramChannel(server).read()],
+                         [b'hello'])
+
+
+class DatagramPollerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._server.bind(('127.0.0.1', 0))
+        self.addCleanup(self._server.close)
+        self._client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._client.bind(('127.0.0.1', 0))
+        self.addCleanup(self._client.close)
+        self._channel = DatagramChannel(self._server, batch_size=2)
+
+    def poller(self, **kwargs):
+        poller = Poller(**kwargs)
+        self.addCleanup(poller.close_all)
+        poller.register(self._channel)
+        return poller
+
+    def send(self, *payloads):
+        for payload in payloads:
+            self._client.sendto(payload, self._server.getsockname())
+
+    def test_poll(self):
+        poller = self.poller()
+        self.send(b'a', b'', b'c')
+        client = self._client.getsockname()
+
+        with timeout(0.02):
+            self.assertEqual(poller.poll(), [([(b'a', client), (b'', client)], self._channel)])
+            self.assertEqual(poller.poll(), [([(b'c', client)], self._channel)])
+        self.assertEqual(poller.poll(0.01), [])
+
+    def test_edge_triggered(self):
+        poller = self.poller(backend='epoll', edge_triggered=True)
+        self.send(b'a', b'b', b'c')
+
+        with timeout(0.02):
+            result = poller.poll()
+
+        self.assertEqual([[p for p, _ in batch] for batch, _ in result],
+                         [[b'a', b'b'], [b'c']])
+
+    def test_budget(self):
+        poller = self.poller(backend='epoll', edge_triggered=True, message_budget=2)
+        self.send(b'a', b'b', b'c')
+
+        with timeout(0.02):
+            self.assertEqual(len(poller.poll()), 1)
+            self.assertEqual(len(poller.poll()), 1)
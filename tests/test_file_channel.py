@@ -0,0 +1,208 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from channels import EndpointClosedException, FileChannel, SocketChannel
+from channels.poller import Poller
+
+from utils import timeout
+
+
+class FileChannelTest(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self._path = os.path.join(tmpdir.name, 'log')
+        self.append(b'')
+
+    def append(self, data, path=None):
+        with open(path or self._path, 'ab') as f:
+            f.write(data)
+
+    def channel(self, **kwargs):
+        chan = FileChannel(self._path, **kwargs)
+        self.addCleanup(chan.close)
+        return chan
+
+    def test_read(self):
+        self.append(b'hello, world')
+        chan = self.channel()
+
+        self.assertEqual(chan.read(), b'hello, world')
+        with self.assertRaises(EndpointClosedException):
+            chan.read()
+
+    def test_read_into(self):
+        self.append(b'hello, world')
+        chan = self.channel()
+        buf = bytearray(5)
+
+        self.assertEqual(chan.read_into(buf), 5)
+        self.assertEqual(buf, b'hello')
+
+    def test_lines(self):
+        self.append(b'hello\nworld\nrest')
+        chan = self.channel(buffering='line')
+
+        self.assertEqual(chan.read(), b'hello\n')
+        self.assertEqual(chan.readlines(), [b'world\n', b'rest'])
+        with self.assertRaises(EndpointClosedException):
+            chan.read()
+
+    def test_views(self):
+        self.append(b'hello\nworld\n')
+        chan = self.channel(buffering='line', views=True)
+
+        line = chan.read()
+
+        self.assertIsInstance(line, memoryview)
+        self.assertEqual(line, b'hello\n')
+
+    def test_max_line(self):
+        self.append(b'hello\nworld\n')
+        chan = self.channel(buffering='line', max_line=10)
+
+        self.assertEqual(chan.readlines(), [b'hello\n', b'world\n'])
+
+    def test_follow(self):
+        self.append(b'hello\nwor')
+        chan = self.channel(buffering='line', follow=True)
+
+        self.assertEqual(chan.readlines(), [b'hello\n'])
+        self.assertEqual(chan.read(), b'')
+
+        self.append(b'ld\n')
+
+        self.assertEqual(chan.read(), b'world\n')
+        self.assertEqual(chan.read(), b'')
+
+    def test_follow_bytes(self):
+        chan = self.channel(follow=True)
+        self.assertEqual(chan.read(), b'')
+
+        self.append(b'hello')
+
+        self.assertEqual(chan.read(), b'hello')
+        self.assertEqual(chan.read(), b'')
+
+    def test_from_end(self):
+        self.append(b'old\n')
+        chan = self.channel(buffering='line', follow=True, from_end=True)
+
+        self.append(b'new\n')
+
+        self.assertEqual(chan.read(), b'new\n')
+
+    def test_truncate(self):
+        self.append(b'hello\n')
+        chan = self.channel(buffering='line', follow=True)
+        self.assertEqual(chan.read(), b'hello\n')
+
+        with open(self._path, 'wb') as f:
+            f.write(b'new\n')
+
+        self.assertEqual(chan.read(), b'new\n')
+
+    def test_rotate(self):
+        self.append(b'hello\n')
+        chan = self.channel(buffering='line', follow=True)
+        self.assertEqual(chan.read(), b'hello\n')
+
+        os.rename(self._path, self._path + '.1')
+        self.append(b'new\n')
+
+        self.assertEqual(chan.read(), b'new\n')
+
+    def test_forward(self):
+        self.append(b'hello')
+        chan = self.channel()
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+
+        self.assertEqual(chan.forward_to(SocketChannel(client)), 5)
+
+        self.assertEqual(server.recv(10), b'hello')
+
+    def test_write(self):
+        chan = self.channel()
+
+        with self.assertRaises(OSError):
+            chan.write(b'hello')
+
+    def test_read_closed(self):
+        chan = self.channel(follow=True)
+        chan.close()
+
+        with self.assertRaises(EndpointClosedException):
+            chan.read()
+
+    def test_unknown_watch(self):
+        with self.assertRaises(ValueError):
+            FileChannel(self._path, watch='bogus')
+
+
+class FileChannelPollerTest(unittest.TestCase):
+
+    watch = 'inotify'
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self._path = os.path.join(tmpdir.name, 'log')
+        with open(self._path, 'wb') as f:
+            f.write(b'hello\n')
+        self._poller = Poller(buffering='line')
+        self.addCleanup(self._poller.close_all)
+
+    def append(self, data):
+        with open(self._path, 'ab') as f:
+            f.write(data)
+
+    def test_follow(self):
+        chan = FileChannel(self._path, buffering='line', follow=True,
+                           watch=self.watch, poll_interval=0.01)
+        self._poller.register(chan)
+
+        with timeout(0.1):
+            self.assertEqual(self._poller.poll(), [(b'hello\n', chan)])
+        self.assertEqual(self._poller.poll(0.03), [])
+
+        self.append(b'world\n')
+
+        result = []
+        with timeout(0.1):
+            while not result:
+                result = self._poller.poll()
+        self.assertEqual(result, [(b'world\n', chan)])
+
+    def test_large_append(self):
+        poller = Poller()
+        self.addCleanup(poller.close_all)
+        chan = FileChannel(self._path, follow=True, from_end=True,
+                           watch=self.watch, poll_interval=0.01)
+        poller.register(chan)
+        data = os.urandom(1048576)
+
+        self.append(data)
+
+        received = b''
+        with timeout(1):
+            while len(received) < len(data):
+                received += b''.join(chunk for chunk, _ in poller.poll())
+        self.assertEqual(received, data)
+
+    def test_whole_file(self):
+        chan = FileChannel(self._path, buffering='line', watch=self.watch)
+        self._poller.register(chan)
+
+        with timeout(0.1):
+            self.assertEqual(self._poller.poll(), [(b'hello\n', chan),
+                                                   (b'', chan)])
+
+
+class TimerFileChannelPollerTest(FileChannelPollerTest):
+
+    watch = 'timer'
@@ -0,0 +1,189 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from unittest import mock
+
+from channels import EndpointClosedException, PipeChannel, SocketChannel
+from channels.poller import Poller
+
+from utils import timeout
+
+
+class ForwardTest(unittest.TestCase):
+
+    def setUp(self):
+        self._in_r, in_w = os.pipe()
+        self._writer = PipeChannel(sink=in_w)
+        self.addCleanup(self._writer.close)
+        self._pipe = PipeChannel(faucet=self._in_r)
+        self.addCleanup(self._pipe.close)
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self.addCleanup(self._client.close)
+        self._sock = SocketChannel(self._client)
+
+    @unittest.skipUnless(hasattr(os, 'splice'), "os.splice is not available")
+    def test_pipe_to_socket(self):
+        self._writer.write(b'hello')
+
+        with mock.patch('os.splice', wraps=os.splice) as splice:
+            self.assertEqual(self._pipe.forward_to(self._sock), 5)
+
+        self.assertTrue(splice.called)
+        self.assertEqual(self._server.recv(10), b'hello')
+
+    def test_socket_to_pipe(self):
+        out_r, out_w = os.pipe()
+        self.addCleanup(os.close, out_r)
+        sink = PipeChannel(sink=out_w)
+        self.addCleanup(sink.close)
+        self._server.send(b'hello')
+
+        self.assertEqual(self._sock.forward_to(sink), 5)
+
+        self.assertEqual(os.read(out_r, 10), b'hello')
+
+    def test_socket_to_socket(self):
+        server2, client2 = socket.socketpair()
+        self.addCleanup(server2.close)
+        self.addCleanup(client2.close)
+        self._server.send(b'hello')
+
+        self.assertEqual(self._sock.forward_to(SocketChannel(client2)), 5)
+
+        self.assertEqual(server2.recv(10), b'hello')
+
+    def test_file_to_socket(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b'hello')
+            f.seek(0)
+            source = PipeChannel(faucet=os.dup(f.fileno()))
+            self.addCleanup(source.close)
+
+            with mock.patch('os.sendfile', wraps=os.sendfile) as sendfile:
+                self.assertEqual(source.forward_to(self._sock), 5)
+                with self.assertRaises(EndpointClosedException):
+                    source.forward_to(self._sock)
+
+        self.assertTrue(sendfile.called)
+        self.assertEqual(self._server.recv(10), b'hello')
+
+    def test_max_bytes(self):
+        self._writer.write(b'hello')
+
+        self.assertEqual(self._pipe.forward_to(self._sock, 3), 3)
+        self.assertEqual(self._pipe.forward_to(self._sock, 3), 2)
+
+        self.assertEqual(self._server.recv(10), b'hello')
+
+    def test_buffered_first(self):
+        pipe = PipeChannel(faucet=os.dup(self._in_r), buffering='line')
+        self.addCleanup(pipe.close)
+        self._writer.write(b'hello\nwor')
+        self.assertEqual(pipe.read(), b'hello\n')
+
+        self.assertEqual(pipe.forward_to(self._sock), 3)
+
+        self.assertEqual(self._server.recv(10), b'wor')
+
+    def test_nothing(self):
+        self.assertEqual(self._pipe.forward_to(self._sock), 0)
+
+    def test_closed(self):
+        self._writer.close()
+
+        with self.assertRaises(EndpointClosedException):
+            self._pipe.forward_to(self._sock)
+
+    def test_pending_output(self):
+        self._sock._enqueue([b'x'])
+        self._writer.write(b'hello')
+
+        self.assertEqual(self._pipe.forward_to(self._sock), 0)
+
+    def test_full_output(self):
+        self._client.setblocking(False)
+        data = b'x' * 65536
+        with self.assertRaises(BlockingIOError):
+            while True:
+                self._client.send(data)
+        self._writer.write(b'hello')
+
+        self.assertEqual(self._pipe.forward_to(self._sock), 5)
+
+        self.assertEqual(self._sock.write_buffer_size, 5)
+
+
+class PollerForwardTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller()
+        self.addCleanup(self._poller.close_all)
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self._sock = SocketChannel(self._client)
+        self._proc_r, self._proc_w = socket.socketpair()
+        self.addCleanup(self._proc_r.close)
+        self._proc = SocketChannel(self._proc_w)
+        self._poller.register(self._sock)
+        self._poller.register(self._proc)
+
+    def test_forward(self):
+        self._poller.forward(self._sock, self._proc)
+        self._poller.forward(self._proc, self._sock)
+        self._server.send(b'request')
+        self._proc_r.send(b'response')
+
+        with timeout(0.02):
+            self.assertEqual(self._poller.poll(), [])
+
+        self.assertEqual(self._proc_r.recv(10), b'request')
+        self.assertEqual(self._server.recv(10), b'response')
+
+    def test_stop_forwarding(self):
+        self._poller.forward(self._sock, self._proc)
+        self._poller.forward(self._sock, None)
+        self._server.send(b'request')
+
+        self.assertEqual(self._poller.poll(0.01), [(b'request', self._sock)])
+
+    def test_closed(self):
+        self._poller.forward(self._sock, self._proc)
+        self._server.close()
+
+        self.assertEqual(self._poller.poll(0.01), [(b'', self._sock)])
+
+    def test_backpressure(self):
+        self._proc_w.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        self._poller.forward(self._sock, self._proc)
+        data = b'x' * 1048576
+        self._server.setblocking(False)
+        sent = 0
+        received = bytearray()
+        with timeout(2):
+            while len(received) < len(data):
+                try:
+                    sent += self._server.send(data[sent:])
+                except BlockingIOError:
+                    pass
+                self.assertEqual(self._poller.poll(0), [])
+                self.assertLessEqual(self._proc.write_buffer_size, 65536)
+                received += self._proc_r.recv(65536)
+
+        self.assertEqual(bytes(received), data)
+
+    def test_unregistered(self):
+        chan = SocketChannel(self._server)
+        with self.assertRaises(KeyError):
+            self._poller.forward(chan, self._proc)
+        with self.assertRaises(KeyError):
+            self._poller.forward(self._proc, chan)
+
+    def test_unregister_target(self):
+        self._poller.forward(self._sock, self._proc)
+        self._poller.unregister(self._proc)
+        self._server.send(b'request')
+
+        self.assertEqual(self._poller.poll(0.01), [(b'request', self._sock)])
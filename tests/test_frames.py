@@ -0,0 +1,129 @@
+import os
+import socket
+import struct
+import unittest
+
+from channels import EndpointClosedException, PipeChannel, SocketChannel
+from channels.testing import TestChannel
+
+
+def frame(data):
+    return struct.pack('!I', len(data)) + data
+
+
+class FrameBufferedTest:
+
+    def feed(self, data):
+        pass
+
+    def test_buffering_property(self):
+        self.assertEqual(self._chan.buffering, 'frame')
+
+    def test_frame(self):
+        self.feed(frame(b'hello\nworld'))
+
+        self.assertEqual(self._chan.read(), b'hello\nworld')
+        self.assertEqual(self._chan.read(), b'')
+
+    def test_partial_header(self):
+        self.feed(frame(b'test')[:2])
+
+        self.assertEqual(self._chan.read(), b'')
+
+        self.feed(frame(b'test')[2:])
+
+        self.assertEqual(self._chan.read(), b'test')
+
+    def test_partial_body(self):
+        self.feed(frame(b'test')[:6])
+
+        self.assertEqual(self._chan.read(), b'')
+
+        self.feed(frame(b'test')[6:])
+
+        self.assertEqual(self._chan.read(), b'test')
+
+    def test_several_frames(self):
+        self.feed(frame(b'a') + frame(b'\n\0') + frame(b'c')[:3])
+
+        self.assertEqual(self._chan.read(), b'a')
+        self.assertEqual(self._chan.read(), b'\n\0')
+        self.assertEqual(self._chan.read(), b'')
+
+    def test_empty_frame(self):
+        self.feed(frame(b'') + frame(b'abc') + frame(b''))
+
+        self.assertEqual(self._chan.read(), b'abc')
+        self.assertEqual(self._chan.read(), b'')
+
+    def test_closed_with_incomplete_frame(self):
+        self.feed(frame(b'a') + frame(b'b')[:3])
+
+        self.assertEqual(self._chan.read(), b'a')
+
+        self._chan.close()
+
+        with self.assertRaises(EndpointClosedException):
+            self._chan.read()
+
+    def test_write_frame(self):
+        self.assertEqual(self._chan.write_frame(b'hello, ', b'world'), 16)
+
+        self.assertEqual(self.fetch(16), frame(b'hello, world'))
+
+
+class FrameBufferedSocketChannelTest(unittest.TestCase, FrameBufferedTest):
+
+    def setUp(self):
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self.addCleanup(self._client.close)
+        self._chan = SocketChannel(self._client, buffering='frame')
+
+    def feed(self, data):
+        self._server.send(data)
+
+    def fetch(self, size):
+        return self._server.recv(size)
+
+
+class FrameBufferedPipeChannelTest(unittest.TestCase, FrameBufferedTest):
+
+    def setUp(self):
+        self._faucet, sink_fd = os.pipe()
+        self._out_faucet, out_sink_fd = os.pipe()
+        self._chan = PipeChannel(self._faucet, out_sink_fd, buffering='frame')
+        self._sink = os.fdopen(sink_fd, mode='wb')
+        self.addCleanup(self._chan.close)
+        self.addCleanup(self._sink.close)
+        self.addCleanup(os.close, self._out_faucet)
+
+    def feed(self, data):
+        self._sink.write(data)
+        self._sink.flush()
+
+    def fetch(self, size):
+        return os.read(self._out_faucet, size)
+
+
+class FrameBufferedTestChannelTest(unittest.TestCase, FrameBufferedTest):
+
+    def setUp(self):
+        self._chan = TestChannel(buffering='frame')
+
+    def feed(self, data):
+        self._chan.put(data)
+
+    def fetch(self, size):
+        return self._chan.get()
+
+
+class FrameHeaderTest(unittest.TestCase):
+
+    def test_short_header(self):
+        chan = TestChannel(buffering='frame', frame_header='<H')
+        self.addCleanup(chan.close)
+
+        chan.put(b'\x03\x00abc')
+
+        self.assertEqual(chan.read(), b'abc')
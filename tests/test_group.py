@@ -0,0 +1,116 @@
+import os
+import select
+import socket
+import time
+import unittest
+
+from channels import DatagramChannel, PipeChannel, SocketChannel
+from channels.group import PollerGroup, _serve
+from channels.poller import Poller, PollEvent
+
+from utils import timeout
+
+
+def _echo(data, channel):
+    if isinstance(data, bytes) and data:
+        channel.write(data)
+
+
+class ServeTest(unittest.TestCase):
+
+    def test_poll_event(self):
+        poller = Poller()
+        sock, peer = socket.socketpair()
+        self.addCleanup(peer.close)
+        chan = SocketChannel(sock)
+        self.addCleanup(chan.close)
+        poller.register(chan, select.POLLOUT)
+        faucet, sink = os.pipe()
+        os.close(sink)
+        seen = []
+
+        def handler(data, channel):
+            seen.append(data)
+            poller.unregister(channel)
+
+        with timeout(1):
+            stats = _serve(poller, PipeChannel(faucet), handler)
+
+        self.assertEqual(seen[0], PollEvent(select.POLLOUT))
+        self.assertEqual(stats, {'accepted': 0, 'closed': 0, 'messages': 0, 'bytes': 0})
+
+    def test_datagrams(self):
+        poller = Poller()
+        sock, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(peer.close)
+        poller.register(DatagramChannel(sock))
+        peer.send(b'hello')
+        peer.send(b'world!')
+        faucet, sink = os.pipe()
+        os.close(sink)
+
+        with timeout(1):
+            stats = _serve(poller, PipeChannel(faucet), lambda data, channel: None)
+
+        self.assertEqual(stats['messages'], 2)
+        self.assertEqual(stats['bytes'], 11)
+
+
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), "SO_REUSEPORT is not available")
+class PollerGroupTest(unittest.TestCase):
+
+    def setUp(self):
+        self._group = PollerGroup(('127.0.0.1', 0), _echo, workers=2)
+        self._group.start()
+        self.addCleanup(self._group.stop, 1)
+
+    def test_echo(self):
+        clients = []
+        for i in range(8):
+            client = socket.create_connection(self._group.address)
+            self.addCleanup(client.close)
+            clients.append(client)
+
+        with timeout(2):
+            for i, client in enumerate(clients):
+                client.sendall(b'hello ' + str(i).encode())
+                self.assertEqual(client.recv(100), b'hello ' + str(i).encode())
+            for client in clients:
+                client.close()
+
+            stats = self._group.stop(1)
+
+        self.assertEqual(len(self._group.worker_stats), 2)
+        self.assertEqual(stats['accepted'], 8)
+        self.assertEqual(stats['messages'], 8)
+        self.assertEqual(stats['bytes'], sum(len(b'hello ') + len(str(i)) for i in range(8)))
+
+    def test_stop(self):
+        with timeout(2):
+            stats = self._group.stop(1)
+
+        self.assertEqual(stats, {'accepted': 0, 'closed': 0, 'messages': 0, 'bytes': 0})
+
+
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), "SO_REUSEPORT is not available")
+class PollerGroupIdleTest(unittest.TestCase):
+
+    def setUp(self):
+        self._group = PollerGroup(('127.0.0.1', 0), _echo, workers=2, idle_timeout=0.1)
+        self._group.start()
+        self.addCleanup(self._group.stop, 1)
+
+    def test_idle_workers(self):
+        with timeout(2):
+            time.sleep(0.3)
+            client = socket.create_connection(self._group.address)
+            self.addCleanup(client.close)
+            client.sendall(b'hello')
+            self.assertEqual(client.recv(100), b'hello')
+            self.assertEqual(client.recv(100), b'')
+
+            stats = self._group.stop(1)
+
+        self.assertEqual(len(self._group.worker_stats), 2)
+        self.assertEqual(stats['accepted'], 1)
+        self.assertEqual(stats['closed'], 1)
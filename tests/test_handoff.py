@@ -0,0 +1,111 @@
+import socket
+import unittest
+
+from channels import SocketChannel
+from channels.handoff import Dispatcher, HandoffPool, HandoffServer
+from channels.poller import Poller
+
+from utils import timeout
+
+
+def _echo(data, channel):
+    if isinstance(data, bytes) and data:
+        channel.write(data)
+
+
+class HandoffTest(unittest.TestCase):
+
+    def setUp(self):
+        links = []
+        self._servers = []
+        self._poller = Poller()
+        self.addCleanup(self._poller.close_all)
+        for _ in range(2):
+            link, worker_link = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            server = HandoffServer(worker_link)
+            self._poller.add_server(server)
+            self._servers.append(server)
+            links.append(link)
+        self._dispatcher = Dispatcher(links)
+        self.addCleanup(self._dispatcher.close)
+
+    def test_dispatch(self):
+        ours, theirs = socket.socketpair()
+        self.addCleanup(theirs.close)
+        channel = SocketChannel(ours, buffering='line')
+
+        self._dispatcher.dispatch(channel, ('127.0.0.1', 12345))
+
+        with timeout(0.1):
+            ((addr, client), server), = self._poller.poll()
+        self.assertEqual(addr, ('127.0.0.1', 12345))
+        self.assertEqual(client.buffering, 'line')
+        self.assertIsInstance(server, HandoffServer)
+
+        theirs.send(b'hello\nworld\n')
+
+        with timeout(0.1):
+            result = self._poller.poll()
+        self.assertEqual(result, [(b'hello\n', client), (b'world\n', client)])
+
+    def test_least_loaded(self):
+        pairs = [socket.socketpair() for _ in range(3)]
+        for ours, theirs in pairs:
+            self.addCleanup(theirs.close)
+
+        workers = [self._dispatcher.dispatch(SocketChannel(ours)) for ours, _ in pairs]
+
+        self.assertEqual(workers, [0, 1, 0])
+
+    def test_load_reports(self):
+        pairs = [socket.socketpair() for _ in range(3)]
+        for ours, theirs in pairs:
+            self.addCleanup(theirs.close)
+        for ours, _ in pairs[:2]:
+            self._dispatcher.dispatch(SocketChannel(ours))
+
+        self._servers[1].report({'closed': 1})
+
+        self.assertEqual(self._dispatcher.loads, [1, 0])
+        self.assertEqual(self._dispatcher.dispatch(SocketChannel(pairs[2][0])), 1)
+
+    def test_dead_worker(self):
+        ours, theirs = socket.socketpair()
+        self.addCleanup(theirs.close)
+        self._servers[0].close()
+
+        self.assertEqual(self._dispatcher.dispatch(SocketChannel(ours)), 1)
+        self.assertEqual(self._dispatcher.loads, [None, 1])
+
+
+class HandoffPoolTest(unittest.TestCase):
+
+    def test_echo(self):
+        pool = HandoffPool(_echo, workers=2)
+        pool.start()
+        self.addCleanup(pool.stop, 1)
+        serv = socket.socket()
+        serv.bind(('127.0.0.1', 0))
+        serv.listen(8)
+        acceptor = Poller()
+        acceptor.add_server(serv)
+        self.addCleanup(acceptor.close_all)
+
+        clients = []
+        with timeout(2):
+            for i in range(4):
+                client = socket.create_connection(serv.getsockname())
+                self.addCleanup(client.close)
+                clients.append(client)
+                for (addr, channel), _ in acceptor.poll(0.1):
+                    acceptor.unregister(channel)
+                    pool.dispatch(channel, addr)
+            for i, client in enumerate(clients):
+                client.sendall(str(i).encode())
+                self.assertEqual(client.recv(10), str(i).encode())
+
+            stats = pool.stop(1)
+
+        self.assertEqual(stats['accepted'], 4)
+        self.assertEqual(stats['messages'], 4)
+        self.assertEqual([s['accepted'] for s in pool.worker_stats], [2, 2])
@@ -1,10 +1,13 @@
 import os
 import socket
+import threading
 import unittest
 
-from channels import EndpointClosedException, PipeChannel, SocketChannel
+from channels import EndpointClosedException, LineTooLongException, PipeChannel, SocketChannel
 from channels.testing import TestChannel
 
+from utils import timeout
+
 
 class LineBufferedTest:
 
@@ -40,6 +43,52 @@ class LineBufferedTest:
         self.assertEqual(self._chan.read(), b'a\n')
         self.assertEqual(self._chan.read(), b'b\n')
 
+    def test_readlines(self):
+        self.feed(b'a\nb\r\nc\rd\ne')
+
+        self.assertEqual(self._chan.readlines(), [b'a\n', b'b\r\n', b'c\rd\n'])
+        self.assertEqual(self._chan.readlines(), [])
+
+        self.feed(b'f\n')
+
+        self.assertEqual(self._chan.readlines(), [b'ef\n'])
+
+    def test_readlines_after_read(self):
+        self.feed(b'a\nb\nc\n')
+
+        self.assertEqual(self._chan.read(), b'a\n')
+        self.assertEqual(self._chan.readlines(), [b'b\n', b'c\n'])
+        self.assertEqual(self._chan.read(), b'')
+
+    def test_readlines_last_line(self):
+        self.feed(b'a\nb\nc')
+
+        self.assertEqual(self._chan.read(), b'a\n')
+
+        self._chan.close()
+
+        self.assertEqual(self._chan.readlines(), [b'b\n', b'c'])
+        with self.assertRaises(EndpointClosedException):
+            self._chan.readlines()
+
+    def test_long_line(self):
+        self.feed(b'x' * 10000)
+        while self._chan.read() == b'' and self._chan._buffered() < 10000:
+            pass
+        self.feed(b'\n')
+
+        self.assertEqual(self._chan.read(), b'x' * 10000 + b'\n')
+
+    def test_read_into_after_line(self):
+        self.feed(b'a\nbc\nd')
+        buf = bytearray(100)
+
+        self.assertEqual(self._chan.read(), b'a\n')
+        count = self._chan.read_into(buf)
+
+        self.assertEqual(buf[:count], b'bc\nd')
+        self.assertEqual(self._chan.read(), b'')
+
     def test_read_last_line(self):
         self.feed(b'\ntest')
 
@@ -95,3 +144,124 @@ class LineBufferedTestChannelTest(unittest.TestCase, LineBufferedTest):
 
     def feed(self, data):
         self._chan.put(data)
+
+
+class DelimiterTest(unittest.TestCase):
+
+    def test_crlf(self):
+        chan = TestChannel(buffering='line', delimiter=b'\r\n')
+        self.addCleanup(chan.close)
+
+        chan.put(b'a\nb\r')
+
+        self.assertEqual(chan.read(), b'')
+
+        chan.put(b'\nc\r\nd')
+
+        self.assertEqual(chan.read(), b'a\nb\r\n')
+        self.assertEqual(chan.readlines(), [b'c\r\n'])
+
+        chan.put(b'\r\n')
+
+        self.assertEqual(chan.readlines(), [b'd\r\n'])
+
+    def test_nul(self):
+        chan = TestChannel(buffering='line', delimiter=b'\0')
+        self.addCleanup(chan.close)
+
+        chan.put(b'a\nb\0c\0d')
+
+        self.assertEqual(chan.read(), b'a\nb\0')
+        self.assertEqual(chan.read(), b'c\0')
+        self.assertEqual(chan.read(), b'')
+
+
+class MaxLineTest(unittest.TestCase):
+
+    def make_channel(self, **kwargs):
+        chan = TestChannel(buffering='line', max_line=4, **kwargs)
+        self.addCleanup(chan.close)
+        return chan
+
+    def test_short_lines(self):
+        chan = self.make_channel()
+
+        chan.put(b'abcd\nx\n')
+
+        self.assertEqual(chan.read(), b'abcd\n')
+        self.assertEqual(chan.read(), b'x\n')
+
+    def test_long_line(self):
+        chan = self.make_channel()
+
+        chan.put(b'abcdef\nx\n')
+
+        with self.assertRaises(LineTooLongException) as cm:
+            chan.read()
+        self.assertEqual(cm.exception.data, b'abcd')
+        self.assertEqual(chan.read(), b'x\n')
+
+    def test_long_partial_line(self):
+        chan = self.make_channel()
+
+        chan.put(b'abcdef')
+
+        with self.assertRaises(LineTooLongException) as cm:
+            chan.read()
+        self.assertEqual(cm.exception.data, b'abcd')
+
+        chan.put(b'ghijkl')
+
+        self.assertEqual(chan.read(), b'')
+        self.assertEqual(chan._buffered(), 0)
+
+        chan.put(b'mn\nx\n')
+
+        self.assertEqual(chan.read(), b'x\n')
+
+    def test_readlines(self):
+        chan = self.make_channel()
+
+        chan.put(b'a\nb\nlong line\nc\n')
+
+        self.assertEqual(chan.readlines(), [b'a\n', b'b\n'])
+        with self.assertRaises(LineTooLongException):
+            chan.readlines()
+        self.assertEqual(chan.readlines(), [b'c\n'])
+
+    def test_close(self):
+        chan = self.make_channel(overflow='close')
+
+        chan.put(b'abcdef\nx\n')
+
+        with self.assertRaises(LineTooLongException):
+            chan.read()
+        with self.assertRaises(EndpointClosedException):
+            chan.read()
+
+    def test_unknown_overflow(self):
+        with self.assertRaises(ValueError):
+            TestChannel(overflow='ignore')
+
+
+class LineBufferBurstTest(unittest.TestCase):
+
+    def setUp(self):
+        self._chan = TestChannel(buffering='line')
+        self.addCleanup(self._chan.close)
+
+    def test_burst(self):
+        lines = [str(i).encode() + b'\n' for i in range(100000)]
+        feeder = threading.Thread(target=self._chan.put, args=(b''.join(lines),))
+
+        result = []
+        with timeout(5):
+            feeder.start()
+            while len(result) < len(lines):
+                line = self._chan.read()
+                if line:
+                    result.append(line)
+            feeder.join()
+
+        self.assertEqual(result, lines)
+        self.assertEqual(self._chan.read(), b'')
@@ -19,6 +19,27 @@ class PipeChannelTest(unittest.TestCase):
         self.assertEqual(channel.read(), b'')
         self.assertEqual(channel.read(), b'')
 
+    def test_read_into(self):
+        that_faucet_fd, this_sink_fd = os.pipe()
+        channel = PipeChannel(faucet=that_faucet_fd)
+        buf = bytearray(100)
+
+        self.assertEqual(channel.read_into(buf), 0)
+        os.write(this_sink_fd, b'hello, world')
+        self.assertEqual(channel.read_into(buf), 12)
+        self.assertEqual(buf[:12], b'hello, world')
+        os.close(this_sink_fd)
+        with self.assertRaises(EndpointClosedException):
+            channel.read_into(buf)
+
+    def test_read_size(self):
+        that_faucet_fd, this_sink_fd = os.pipe()
+        channel = PipeChannel(faucet=that_faucet_fd, read_size=5)
+        os.write(this_sink_fd, b'hello, world')
+
+        self.assertEqual(channel.read(), b'hello')
+        self.assertEqual(channel.read(), b', wor')
+
     def test_buffering_property(self):
         that_faucet_fd, this_sink_fd = os.pipe()
         channel = PipeChannel(faucet=that_faucet_fd)
@@ -73,6 +94,25 @@ class PipeChannelTest(unittest.TestCase):
         self.assertEqual(faucet_file.readline(), b'')
         self.assertEqual(faucet_file.readline(), b'')
 
+    def test_write_returns_size(self):
+        this_faucet_fd, that_sink_fd = os.pipe()
+        channel = PipeChannel(sink=that_sink_fd)
+        self.addCleanup(os.close, this_faucet_fd)
+
+        self.assertEqual(channel.write(b'hello, ', b'', b'world\n'), 13)
+
+        self.assertEqual(os.read(this_faucet_fd, 100), b'hello, world\n')
+
+    def test_write_many_chunks(self):
+        this_faucet_fd, that_sink_fd = os.pipe()
+        channel = PipeChannel(sink=that_sink_fd)
+        self.addCleanup(os.close, this_faucet_fd)
+        chunks = [str(i).encode() for i in range(5000)]
+
+        self.assertEqual(channel.write(*chunks), len(b''.join(chunks)))
+
+        self.assertEqual(os.read(this_faucet_fd, 65536), b''.join(chunks))
+
     def test_closed_read(self):
         that_faucet_fd, _ = os.pipe()
         faucet = PipeChannel(that_faucet_fd)
@@ -1,8 +1,14 @@
+import select
 import socket
+import struct
+import threading
+import time
 import unittest
 
-from channels import Channel, EndpointClosedException
-from channels.poller import Poller
+from concurrent.futures import ThreadPoolExecutor
+
+from channels import Channel, EndpointClosedException, LineTooLongException, SocketChannel
+from channels.poller import Poller, PollEvent
 from channels.testing import TestChannel
 
 from utils import timeout
@@ -53,6 +59,36 @@ class PollerTest(unittest.TestCase):
 
         self.assertEqual(list(result), [(b'hello\n', chan)])
 
+    def test_call_later(self):
+        fired = []
+        self._poller.call_later(0.01, fired.append, 'a')
+        self._poller.call_at(self._poller.time() + 0.02, fired.append, 'b')
+
+        with timeout(0.1):
+            self.assertEqual(self._poller.poll(), [])
+            self.assertEqual(fired, ['a'])
+            self._poller.poll()
+            self.assertEqual(fired, ['a', 'b'])
+
+    def test_timer_shortens_timeout(self):
+        fired = []
+        self._poller.call_later(0.01, fired.append, 'a')
+
+        with timeout(0.05):
+            self._poller.poll(1)
+
+        self.assertEqual(fired, ['a'])
+
+    def test_cancelled_timer(self):
+        fired = []
+        timer = self._poller.call_later(0.01, fired.append, 'a')
+        timer.cancel()
+
+        with timeout(0.05):
+            self._poller.poll(0.02)
+
+        self.assertEqual(fired, [])
+
     def test_poll_no_data(self):
         chan = TestChannel()
         self._poller.register(chan)
@@ -70,6 +106,22 @@ class PollerTest(unittest.TestCase):
         result = self._poller.poll(0.01)
         self.assertEqual(list(result), [(b'hello\n', cl_chan)])
 
+    def test_flush_pending(self):
+        client, cl_chan = _connect_and_get_client_channel(self, self._poller)
+        self.addCleanup(client.close)
+        data = b'x' * 16777216
+        cl_chan.write(data)
+        self.assertGreater(cl_chan.write_buffer_size, 0)
+
+        received = b''
+        with timeout(1):
+            while len(received) < len(data):
+                self.assertEqual(self._poller.poll(0.01), [])
+                received += client.recv(1048576)
+
+        self.assertEqual(received, data)
+        self.assertEqual(cl_chan.write_buffer_size, 0)
+
     def test_close_all_channels(self):
         chan = TestChannel()
         self._poller.register(chan)
@@ -138,6 +190,201 @@ class PollerTest(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class AcceptTest(unittest.TestCase):
+
+    def connect(self, poller, count):
+        serv = socket.socket()
+        serv.bind(('127.0.0.1', 0))
+        serv.listen(16)
+        self.addCleanup(serv.close)
+        poller.add_server(serv)
+        for _ in range(count):
+            client = socket.create_connection(serv.getsockname())
+            self.addCleanup(client.close)
+
+    def test_accept_backlog(self):
+        poller = Poller()
+        self.addCleanup(poller.close_all)
+        self.connect(poller, 5)
+
+        result = poller.poll(0.01)
+
+        self.assertEqual(len(result), 5)
+        for (_, client), _ in result:
+            self.assertEqual(client._sock.gettimeout(), 0)
+
+    def test_accept_limit(self):
+        poller = Poller(accept_limit=2)
+        self.addCleanup(poller.close_all)
+        self.connect(poller, 5)
+
+        self.assertEqual([len(poller.poll(0.01)) for _ in range(4)], [2, 2, 1, 0])
+
+    def test_accept_limit_edge_triggered(self):
+        poller = Poller(accept_limit=2, backend='epoll', edge_triggered=True)
+        self.addCleanup(poller.close_all)
+        self.connect(poller, 5)
+
+        self.assertEqual([len(poller.poll(0.01)) for _ in range(4)], [2, 2, 1, 0])
+
+
+class IdleTimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller(idle_timeout=0.04)
+        self.addCleanup(self._poller.close_all)
+
+    def test_reap(self):
+        chan = TestChannel()
+        self._poller.register(chan)
+
+        with timeout(0.2):
+            result = self._poller.poll()
+
+        self.assertEqual(result, [(b'', chan)])
+        with self.assertRaises(EndpointClosedException):
+            chan.read()
+        self.assertEqual(self._poller.poll(0.06), [])
+
+    def test_activity(self):
+        active = TestChannel()
+        idle = TestChannel()
+        self._poller.register(active)
+        self._poller.register(idle)
+
+        result = []
+        with timeout(0.2):
+            while not result:
+                active.put(b'x')
+                result = [r for r in self._poller.poll(0.01) if r[0] != b'x']
+
+        self.assertEqual(result, [(b'', idle)])
+        self.assertEqual(active.read(), b'')
+
+    def test_unregistered(self):
+        chan = TestChannel()
+        self._poller.register(chan)
+        self._poller.unregister(chan)
+
+        self.assertEqual(self._poller.poll(0.06), [])
+
+    def test_not_reaped(self):
+        chan = TestChannel()
+        self._poller.register(chan, reap=False)
+
+        self.assertEqual(self._poller.poll(0.06), [])
+        chan.put(b'x')
+        self.assertEqual(self._poller.poll(0.06), [(b'x', chan)])
+        self.assertEqual(self._poller.poll(0.06), [])
+
+
+class EpollPollerTest(PollerTest):
+
+    def setUp(self):
+        self._poller = Poller(backend='epoll')
+
+    def test_closed(self):
+        # epoll silently forgets descriptors once they are closed
+        chan = TestChannel()
+        self._poller.register(chan)
+
+        chan.close()
+
+        self.assertEqual(self._poller.poll(0.01), [])
+
+
+class EdgeTriggeredPollerTest(EpollPollerTest):
+
+    def setUp(self):
+        self._poller = Poller(backend='epoll', edge_triggered=True)
+
+    def test_poll_drains_channel(self):
+        chan = TestChannel()
+        self._poller.register(chan)
+        chan.put(b'x' * 10000)
+
+        with timeout(0.02):
+            result = self._poller.poll()
+
+        self.assertEqual(result, [(b'x' * 10000, chan)])
+
+    def test_accept_backlog(self):
+        serv = socket.socket()
+        serv.bind(('127.0.0.1', 0))
+        serv.listen(5)
+        self.addCleanup(serv.close)
+        self._poller.add_server(serv)
+        clients = [socket.create_connection(serv.getsockname()) for _ in range(3)]
+        for client in clients:
+            self.addCleanup(client.close)
+
+        result = self._poller.poll(0.01)
+
+        self.assertEqual(len(result), 3)
+
+
+class ArenaPollerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller(arena_size=8)
+        self.addCleanup(self._poller.close_all)
+
+    def test_poll_data(self):
+        chan = TestChannel()
+        self._poller.register(chan)
+        chan.put(b'hello\n')
+
+        with timeout(0.02):
+            (data, channel), = self._poller.poll()
+        arena = data.obj
+
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(data, b'hello\n')
+        self.assertIs(channel, chan)
+
+        chan.put(b'world, hello')
+        self.assertEqual(self._poller.poll(0.01), [(b'world, h', chan)])
+        (data, _), = self._poller.poll(0.01)
+        self.assertEqual(data, b'ello')
+        self.assertIs(data.obj, arena)
+
+    def test_closed(self):
+        chan = TestChannel()
+        self._poller.register(chan)
+        chan.put(b'hello\n')
+        chan._inner.close()
+
+        result = self._poller.poll(0.01)
+        self.assertEqual(result, [(b'hello\n', chan)])
+        result = self._poller.poll(0.01)
+        self.assertEqual(result, [(b'', chan)])
+
+    def test_edge_triggered(self):
+        poller = Poller(backend='epoll', edge_triggered=True, arena_size=8)
+        chan = TestChannel()
+        poller.register(chan)
+        chan.put(b'hello, world')
+        chan._inner.close()
+
+        result = poller.poll(0.01)
+
+        self.assertEqual(result, [(b'hello, w', chan), (b'orld', chan), (b'', chan)])
+
+
+class PollerBackendTest(unittest.TestCase):
+
+    def test_auto(self):
+        Poller(backend='auto')
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            Poller(backend='kqueue')
+
+    def test_edge_triggered_poll(self):
+        with self.assertRaises(ValueError):
+            Poller(backend='poll', edge_triggered=True)
+
+
 class LineBufferedPollerTest(unittest.TestCase):
 
     def setUp(self):
@@ -168,6 +415,392 @@ class LineBufferedPollerTest(unittest.TestCase):
         self.assertEqual(result, [(b'test\n', self._cl_chan),
                                   (b'rest\n', self._cl_chan)])
 
+    def test_iter_events(self):
+        self._client.send(b'test\nrest\n')
+
+        events = self._poller.iter_events(0.01)
+
+        self.assertEqual(next(events), (b'test\n', self._cl_chan))
+        self.assertEqual(next(events), (b'rest\n', self._cl_chan))
+        self.assertEqual(list(events), [])
+
+    def test_iter_events_closed_early(self):
+        client2, chan2 = _connect_and_get_client_channel(self, self._poller)
+        self.addCleanup(client2.close)
+        self._client.send(b'a\nb\nc\n')
+        client2.send(b'd\n')
+        time.sleep(0.01)
+
+        events = self._poller.iter_events(0.01)
+        first = next(events)
+        events.close()
+
+        with timeout(0.02):
+            result = [first] + self._poller.poll()
+
+        self.assertEqual(sorted(data for data, _ in result),
+                         [b'a\n', b'b\n', b'c\n', b'd\n'])
+        self.assertEqual(self._poller.poll(0), [])
+
+
+    def test_iter_events_unregister_other(self):
+        poller = Poller()
+        first, second = TestChannel(), TestChannel()
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        poller.register(first)
+        poller.register(second)
+        first.put(b'a')
+        second.put(b'b')
+
+        result = []
+        for data, channel in poller.iter_events(0.01):
+            result.append(data)
+            poller.unregister(second if channel is first else first)
+
+        self.assertEqual(len(result), 1)
+
+
+class BudgetPollerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller(buffering='line', message_budget=2)
+        self._client, self._cl_chan = _connect_and_get_client_channel(self, self._poller)
+
+    def tearDown(self):
+        self._poller.close_all()
+
+    def test_carry_over(self):
+        self._client.send(b'1\n2\n3\n4\n5\n')
+
+        self.assertEqual(self._poller.poll(0.01), [(b'1\n', self._cl_chan),
+                                                   (b'2\n', self._cl_chan)])
+        with timeout(0.02):
+            self.assertEqual(self._poller.poll(), [(b'3\n', self._cl_chan),
+                                                   (b'4\n', self._cl_chan)])
+            self.assertEqual(self._poller.poll(), [(b'5\n', self._cl_chan)])
+        self.assertEqual(self._poller.poll(0), [])
+
+    def test_no_read_for_carried(self):
+        self._client.send(b'1\n2\n3\n')
+        self._poller.poll(0.01)
+        reads = []
+        read_chunk = self._cl_chan._read_chunk
+        def counting_read(size):
+            reads.append(size)
+            return read_chunk(size)
+        self._cl_chan._read_chunk = counting_read
+
+        with timeout(0.02):
+            self.assertEqual(self._poller.poll(), [(b'3\n', self._cl_chan)])
+
+        self.assertEqual(reads, [])
+
+    def test_round_robin(self):
+        client2, chan2 = _connect_and_get_client_channel(self, self._poller)
+        self.addCleanup(client2.close)
+        self._client.send(b'1\n2\n3\n')
+        time.sleep(0.01)
+        self._poller.poll(0.01)
+        client2.send(b'a\n')
+
+        result = self._poller.poll(0.01)
+
+        self.assertEqual(result, [(b'a\n', chan2), (b'3\n', self._cl_chan)])
+
+    def test_byte_budget(self):
+        poller = Poller(backend='epoll', edge_triggered=True, byte_budget=10)
+        self.addCleanup(poller.close_all)
+        client, chan = _connect_and_get_client_channel(self, poller)
+        self.addCleanup(client.close)
+        client.send(b'x' * 100000)
+        time.sleep(0.01)
+
+        result = poller.poll(0.01)
+        while poller.poll(0):
+            pass
+
+        self.assertEqual(len(result), 1)
+        self.assertLess(len(result[0][0]), 100000)
+
+    def test_batch_lines(self):
+        poller = Poller(batch_lines=True, byte_budget=4)
+        self.addCleanup(poller.close_all)
+        chan = TestChannel(buffering='line', read_size=4)
+        poller.register(chan)
+        chan.put(b'1\n2\n3\n4\n5\n')
+
+        with timeout(0.1):
+            self.assertEqual(poller.poll(), [([b'1\n', b'2\n'], chan)])
+            self.assertEqual(poller.poll(), [([b'3\n', b'4\n'], chan)])
+            self.assertEqual(poller.poll(), [([b'5\n'], chan)])
+
+
+class PausePollerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller(buffering='line', read_high_watermark=10)
+        self._client, self._cl_chan = _connect_and_get_client_channel(self, self._poller)
+
+    def tearDown(self):
+        self._poller.close_all()
+
+    def test_pause(self):
+        self._poller.pause(self._cl_chan)
+        self._client.send(b'hello\n')
+
+        self.assertEqual(self._poller.poll(0.01), [])
+
+        self._poller.resume(self._cl_chan)
+
+        self.assertEqual(self._poller.poll(0.01), [(b'hello\n', self._cl_chan)])
+
+    def test_pause_carried(self):
+        poller = Poller(buffering='line', message_budget=1)
+        self.addCleanup(poller.close_all)
+        chan = TestChannel(buffering='line')
+        poller.register(chan)
+        chan.put(b'a\nb\nc\n')
+
+        self.assertEqual(poller.poll(0.01), [(b'a\n', chan)])
+        poller.pause(chan)
+        self.assertEqual(poller.poll(0.01), [])
+        self.assertEqual(poller.poll(0.01), [])
+        poller.resume(chan)
+        self.assertEqual(poller.poll(0.01), [(b'b\n', chan)])
+
+    def test_pause_idle(self):
+        poller = Poller(idle_timeout=0.04)
+        self.addCleanup(poller.close_all)
+        chan = TestChannel()
+        poller.register(chan)
+
+        poller.pause(chan)
+        self.assertEqual(poller.poll(0.08), [])
+        chan.put(b'x')
+        poller.resume(chan)
+
+        self.assertEqual(poller.poll(0.01), [(b'x', chan)])
+
+    def test_pause_with_pending_write(self):
+        self._poller.pause(self._cl_chan)
+        self._cl_chan._enqueue([b'hello'])
+        self._client.send(b'hello\n')
+
+        self.assertEqual(self._poller.poll(0.01), [])
+        self.assertEqual(self._client.recv(10), b'hello')
+
+    def test_queue_depth(self):
+        self._poller.report_queue_depth(self._cl_chan, 11)
+        self._client.send(b'hello\n')
+
+        self.assertEqual(self._poller.poll(0.01), [])
+
+        self._poller.report_queue_depth(self._cl_chan, 5)
+        self.assertEqual(self._poller.poll(0.01), [])
+
+        self._poller.report_queue_depth(self._cl_chan, 2)
+        self.assertEqual(self._poller.poll(0.01), [(b'hello\n', self._cl_chan)])
+
+    def test_partial_line(self):
+        self._client.send(b'x' * 20)
+        self.assertEqual(self._poller.poll(0.01), [])
+
+        self._client.send(b'\nhello\n')
+
+        self.assertEqual(self._poller.poll(0.01), [(b'x' * 20 + b'\n', self._cl_chan),
+                                                   (b'hello\n', self._cl_chan)])
+
+    def test_complete_lines(self):
+        poller = Poller(buffering='line', read_high_watermark=4, message_budget=1)
+        self.addCleanup(poller.close_all)
+        client, chan = _connect_and_get_client_channel(self, poller)
+        self.addCleanup(client.close)
+        client.send(b'hello\nworld\n')
+        time.sleep(0.01)
+
+        self.assertEqual(poller.poll(0.01), [(b'hello\n', chan)])
+        self.assertFalse(poller._masks[chan.get_fd()] & select.POLLIN)
+
+    def test_carried(self):
+        poller = Poller(buffering='line', read_high_watermark=4, message_budget=1)
+        self.addCleanup(poller.close_all)
+        client, chan = _connect_and_get_client_channel(self, poller)
+        self.addCleanup(client.close)
+        client.send(b'1\n2\n3\n4\n')
+
+        result = [poller.poll(0.01) for _ in range(5)]
+
+        self.assertEqual(result, [[(b'1\n', chan)], [(b'2\n', chan)],
+                                  [(b'3\n', chan)], [(b'4\n', chan)], []])
+
+
+class EventMaskTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller()
+        self.addCleanup(self._poller.close_all)
+        self._serv = socket.socket()
+        self._serv.bind(('127.0.0.1', 0))
+        self._serv.listen(1)
+        self.addCleanup(self._serv.close)
+
+    def _connect(self, address):
+        sock = socket.socket()
+        sock.setblocking(False)
+        sock.connect_ex(address)
+        return SocketChannel(sock)
+
+    def test_connect(self):
+        chan = self._connect(self._serv.getsockname())
+        self._poller.register(chan, events=select.POLLOUT)
+
+        with timeout(0.02):
+            result = self._poller.poll()
+
+        self.assertEqual(result, [(PollEvent(select.POLLOUT), chan)])
+
+        self._poller.modify(chan, select.POLLIN)
+        self.assertEqual(self._poller.poll(0.01), [])
+        server, _ = self._serv.accept()
+        self.addCleanup(server.close)
+        server.send(b'hello')
+        self.assertEqual(self._poller.poll(0.01), [(b'hello', chan)])
+
+    def test_connect_refused(self):
+        address = self._serv.getsockname()
+        self._serv.close()
+        chan = self._connect(address)
+        self._poller.register(chan, events=select.POLLOUT | select.POLLERR)
+
+        with timeout(0.02):
+            [(event, channel)] = self._poller.poll()
+
+        self.assertIs(channel, chan)
+        self.assertTrue(event.events & select.POLLERR)
+
+    def test_not_reported(self):
+        chan = self._connect(self._serv.getsockname())
+        self._poller.register(chan)
+        chan.write(b'hello')
+
+        self.assertEqual(self._poller.poll(0.01), [])
+
+    def test_modify_unregistered(self):
+        chan = TestChannel()
+        self.addCleanup(chan.close)
+
+        with self.assertRaises(KeyError):
+            self._poller.modify(chan, select.POLLIN)
+
+
+class MaxLinePollerTest(unittest.TestCase):
+
+    def connect(self, **options):
+        poller = Poller(buffering='line', channel_options=dict(max_line=4, **options))
+        self.addCleanup(poller.close_all)
+        client, cl_chan = _connect_and_get_client_channel(self, poller)
+        self.addCleanup(client.close)
+        return poller, client, cl_chan
+
+    def test_truncate(self):
+        poller, client, cl_chan = self.connect()
+
+        client.send(b'a\nlong line\nb\n')
+        (first, _), (error, chan), (last, _) = poller.poll(0.01)
+
+        self.assertEqual((first, last), (b'a\n', b'b\n'))
+        self.assertIsInstance(error, LineTooLongException)
+        self.assertEqual(error.data, b'long')
+        self.assertIs(chan, cl_chan)
+
+    def test_close(self):
+        poller, client, cl_chan = self.connect(overflow='close')
+
+        client.send(b'long line\nb\n')
+        (error, _), (data, chan) = poller.poll(0.01)
+
+        self.assertIsInstance(error, LineTooLongException)
+        self.assertEqual((data, chan), (b'', cl_chan))
+        self.assertEqual(poller.poll(0.01), [])
+
+
+    def test_edge_triggered(self):
+        poller = Poller(buffering='line', backend='epoll', edge_triggered=True)
+        self.addCleanup(poller.close_all)
+        chan = TestChannel(buffering='line', max_line=100, read_size=1024)
+        poller.register(chan)
+        buffered = []
+        read_into_buffer = chan._read_into_buffer
+        def tracking_read():
+            count = read_into_buffer()
+            buffered.append(chan._buffered())
+            return count
+        chan._read_into_buffer = tracking_read
+        chan.put(b'a\n' + b'x' * 60000)
+
+        (first, _), (error, _) = poller.poll(0.01)
+        chan.put(b'\nok\n')
+
+        self.assertEqual(first, b'a\n')
+        self.assertIsInstance(error, LineTooLongException)
+        self.assertLess(max(buffered), 2048)
+        self.assertEqual(poller.poll(0.01), [(b'ok\n', chan)])
+
+
+class BatchLinesPollerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller(buffering='line', batch_lines=True)
+        self._client, self._cl_chan = _connect_and_get_client_channel(self, self._poller)
+        self.addCleanup(self._poller.close_all)
+        self.addCleanup(self._client.close)
+
+    def test_partial_line(self):
+        self._client.send(b'test')
+
+        self.assertEqual(self._poller.poll(0.01), [])
+
+    def test_lines(self):
+        self._client.send(b'test\nrest\npart')
+
+        result = self._poller.poll(0.01)
+
+        self.assertEqual(result, [([b'test\n', b'rest\n'], self._cl_chan)])
+
+    def test_closed(self):
+        self._client.send(b'test\nrest')
+        self._client.close()
+
+        result = self._poller.poll(0.01)
+
+        self.assertEqual(result, [([b'test\n', b'rest'], self._cl_chan),
+                                  (b'', self._cl_chan)])
+
+
+class EdgeTriggeredLineBufferedPollerTest(LineBufferedPollerTest):
+
+    def setUp(self):
+        self._poller = Poller(buffering='line', backend='epoll', edge_triggered=True)
+        self._client, self._cl_chan = _connect_and_get_client_channel(self, self._poller)
+
+    def test_long_line(self):
+        self._client.send(b'x' * 10000 + b'\ny')
+
+        result = list(self._poller.poll(0.01))
+
+        self.assertEqual(result, [(b'x' * 10000 + b'\n', self._cl_chan)])
+
+    def test_last_line(self):
+        self._client.send(b'test\nrest')
+        self._client.close()
+
+        result = list(self._poller.poll(0.01))
+
+        self.assertEqual(result, [(b'test\n', self._cl_chan),
+                                  (b'rest', self._cl_chan),
+                                  (b'', self._cl_chan)])
+
 
 class PollerBufferingTest(unittest.TestCase):
 
@@ -184,3 +817,130 @@ class PollerBufferingTest(unittest.TestCase):
         _, cl_chan = _connect_and_get_client_channel(self, poller)
 
         self.assertEqual(cl_chan.buffering, 'line')
+
+    def test_frame_poller(self):
+        poller = Poller(buffering='frame', channel_options={'frame_header': '!H'})
+        self.addCleanup(poller.close_all)
+        client, cl_chan = _connect_and_get_client_channel(self, poller)
+        self.addCleanup(client.close)
+
+        client.send(b'\x00\x02a\n\x00\x01b\x00')
+
+        self.assertEqual(cl_chan.buffering, 'frame')
+        self.assertEqual(poller.poll(0.01), [(b'a\n', cl_chan), (b'b', cl_chan)])
+
+    def test_empty_frame(self):
+        poller = Poller(buffering='frame')
+        self.addCleanup(poller.close_all)
+        chan = TestChannel(buffering='frame')
+        poller.register(chan)
+
+        chan.put(struct.pack('!I', 0) + struct.pack('!I', 3) + b'abc')
+
+        self.assertEqual(poller.poll(0), [(b'abc', chan)])
+        self.assertEqual(poller.poll(0), [])
+
+
+class RunTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller(buffering='line')
+        self.addCleanup(self._poller.close_all)
+        self._serv = socket.socket()
+        self._serv.bind(('127.0.0.1', 0))
+        self._serv.listen(0)
+        self._poller.add_server(self._serv)
+        self._events = []
+
+    def start(self, on_data, **kwargs):
+        thread = threading.Thread(
+            target=self._poller.run, args=(on_data,),
+            kwargs=dict(on_accept=lambda c, a: self._events.append('accept'),
+                        on_close=lambda c: self._events.append('close'),
+                        **kwargs))
+        thread.start()
+        self.addCleanup(thread.join, 1)
+        self.addCleanup(self._poller.stop)
+        client = socket.create_connection(self._serv.getsockname())
+        self.addCleanup(client.close)
+        return thread, client
+
+    def receive(self, client, size):
+        result = b''
+        while len(result) < size:
+            result += client.recv(size)
+        return result
+
+    def test_inline(self):
+        thread, client = self.start(bytes.upper)
+
+        with timeout(1):
+            client.sendall(b'hello\nworld\n')
+            self.assertEqual(self.receive(client, 12), b'HELLO\nWORLD\n')
+            client.close()
+            while 'close' not in self._events:
+                time.sleep(0.001)
+            self._poller.stop()
+            thread.join()
+
+        self.assertEqual(self._events, ['accept', 'close'])
+
+    def test_executor_order(self):
+        def handler(data):
+            time.sleep((5 - int(data)) * 0.01)
+            return data
+        executor = ThreadPoolExecutor(4)
+        self.addCleanup(executor.shutdown)
+        thread, client = self.start(handler, executor=executor)
+        expected = b''.join(str(i).encode() + b'\n' for i in range(5))
+
+        with timeout(1):
+            client.sendall(expected)
+            self.assertEqual(self.receive(client, len(expected)), expected)
+
+    def test_on_event(self):
+        sock, peer = socket.socketpair()
+        self.addCleanup(peer.close)
+        chan = SocketChannel(sock)
+        self._poller.register(chan, select.POLLIN | select.POLLOUT)
+        events = []
+
+        def on_event(channel, mask):
+            events.append((channel, mask))
+            self._poller.stop()
+
+        with timeout(1):
+            self._poller.run(self.fail, on_event=on_event)
+
+        self.assertEqual(events, [(chan, select.POLLOUT)])
+        peer.setblocking(False)
+        with self.assertRaises(BlockingIOError):
+            peer.recv(10)
+
+    def test_executor_arena(self):
+        self._poller = Poller(arena_size=64)
+        self.addCleanup(self._poller.close_all)
+        self._poller.add_server(self._serv)
+        received = []
+        def handler(data):
+            time.sleep(0.05)
+            received.append(bytes(data))
+        executor = ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        thread, client = self.start(handler, executor=executor)
+
+        with timeout(1):
+            client.sendall(b'first')
+            time.sleep(0.01)
+            client.sendall(b'SECOND')
+            while len(received) < 2:
+                time.sleep(0.01)
+
+        self.assertEqual(received, [b'first', b'SECOND'])
+
+    def test_stop(self):
+        thread, client = self.start(lambda data: self._poller.stop())
+
+        with timeout(1):
+            client.sendall(b'stop\n')
+            thread.join()
@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+import struct
+import unittest
+
+from channels import EndpointClosedException
+from channels.poller import Poller
+from channels.shm import SharedMemoryChannel
+
+from utils import timeout
+
+
+def _produce(chan, other, size):
+    other.detach()
+    chan.write(b'x' * size)
+    chan.close()
+
+
+class SharedMemoryChannelTest(unittest.TestCase):
+
+    def pair(self, size=64, **kwargs):
+        a, b = SharedMemoryChannel.pair(size, **kwargs)
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        return a, b
+
+    def test_read_write(self):
+        a, b = self.pair()
+
+        self.assertEqual(b.read(), b'')
+        self.assertEqual(a.write(b'hello, ', b'world'), 12)
+        self.assertEqual(b.read(), b'hello, world')
+        self.assertEqual(b.read(), b'')
+        b.write(b'back')
+        self.assertEqual(a.read(), b'back')
+
+    def test_read_into(self):
+        a, b = self.pair()
+        buf = bytearray(5)
+        a.write(b'hello, world')
+
+        self.assertEqual(b.read_into(buf), 5)
+        self.assertEqual(buf, b'hello')
+
+    def test_wrap_around(self):
+        a, b = self.pair(16)
+
+        for i in range(10):
+            data = bytes([i]) * 11
+            a.write(data)
+            self.assertEqual(b.read(), data)
+
+    def test_lines(self):
+        a, b = self.pair(buffering='line')
+        a.write(b'hello\nwor')
+
+        self.assertEqual(b.read(), b'hello\n')
+        self.assertEqual(b.read(), b'')
+        a.write(b'ld\n')
+        self.assertEqual(b.read(), b'world\n')
+
+    def test_frames(self):
+        a, b = self.pair(buffering='frame')
+        a.write_frame(b'hello')
+        a.write_frame(b'world')
+
+        self.assertEqual(b.read(), b'hello')
+        self.assertEqual(b.read(), b'world')
+
+    def test_doorbell(self):
+        a, b = self.pair()
+
+        a.write(b'hello')
+        a.write(b'world')
+
+        self.assertEqual(struct.unpack('Q', os.read(b.get_fd(), 8)), (1,))
+        self.assertEqual(b.read(), b'helloworld')
+        a.write(b'again')
+        self.assertEqual(struct.unpack('Q', os.read(b.get_fd(), 8)), (1,))
+
+    def test_close(self):
+        a, b = self.pair()
+        a.write(b'hello')
+
+        a.close()
+
+        self.assertEqual(b.read(), b'hello')
+        with self.assertRaises(EndpointClosedException):
+            b.read()
+        with self.assertRaises(EndpointClosedException):
+            b.write(b'hello')
+
+    def test_detach(self):
+        a, b = self.pair()
+        fds = [a.get_fd(), b.get_fd()]
+        a.write(b'hello')
+
+        b.detach()
+
+        for fd in fds:
+            os.fstat(fd)
+        a.close()
+        for fd in fds:
+            with self.assertRaises(OSError):
+                os.fstat(fd)
+
+    def test_poller(self):
+        poller = Poller(buffering='line')
+        a, b = self.pair(buffering='line')
+        poller.register(b)
+        a.write(b'hello\nworld\n')
+
+        with timeout(0.02):
+            result = poller.poll()
+
+        self.assertEqual(result, [(b'hello\n', b), (b'world\n', b)])
+        self.assertEqual(poller.poll(0.01), [])
+
+    def test_other_process(self):
+        a, b = self.pair(4096)
+        size = 1048576
+        process = multiprocessing.get_context('fork').Process(target=_produce, args=(a, b, size))
+        process.start()
+        a.detach()
+        self.addCleanup(process.join)
+        self.addCleanup(process.terminate)
+
+        received = 0
+        poller = Poller()
+        poller.register(b)
+        with timeout(5):
+            while True:
+                data, _ = poller.poll()[0]
+                if not data:
+                    break
+                received += len(data)
+
+        self.assertEqual(received, size)
@@ -23,6 +23,24 @@ class SocketChannelTest(unittest.TestCase):
         self.assertEqual(self._channel.read(), b'')
         self.assertEqual(self._channel.read(), b'')
 
+    def test_read_into(self):
+        buf = bytearray(5)
+        self._server.send(b'hello, world')
+
+        self.assertEqual(self._channel.read_into(buf), 5)
+        self.assertEqual(buf, b'hello')
+        self.assertEqual(self._channel.read_into(buf), 5)
+        self.assertEqual(buf, b', wor')
+        self.assertEqual(self._channel.read_into(memoryview(buf)[2:]), 2)
+        self.assertEqual(buf, b', ldr')
+        self.assertEqual(self._channel.read_into(buf), 0)
+
+    def test_read_into_closed(self):
+        self._server.close()
+
+        with self.assertRaises(EndpointClosedException):
+            self._channel.read_into(bytearray(5))
+
     def test_write(self):
         self._channel.write(b'hello, world')
 
@@ -33,6 +51,16 @@ class SocketChannelTest(unittest.TestCase):
 
         self.assertEqual(self._server.recv(4096), b'hello, world')
 
+    def test_write_returns_size(self):
+        self.assertEqual(self._channel.write(b'hello, ', b'world'), 12)
+
+    def test_write_many_chunks(self):
+        chunks = [str(i).encode() for i in range(5000)]
+
+        self._channel.write(*chunks)
+
+        self.assertEqual(self._server.recv(65536), b''.join(chunks))
+
     def test_closed_read(self):
         self._client.close()
 
@@ -69,3 +97,131 @@ class SocketChannelTest(unittest.TestCase):
 
     def test_get_fd(self):
         self.assertEqual(self._channel.get_fd(), self._client.fileno())
+
+
+class SocketChannelQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self.addCleanup(self._client.close)
+        self._channel = SocketChannel(self._client,
+                                      high_watermark=1024, low_watermark=256)
+
+    def _receive(self, size):
+        result = b''
+        while len(result) < size:
+            self._channel.flush()
+            result += self._server.recv(65536)
+        return result
+
+    def test_write_full_buffer(self):
+        data = bytes(range(256)) * 4096
+
+        written = self._channel.write(data, b'tail')
+
+        self.assertEqual(written + self._channel.write_buffer_size, len(data) + 4)
+        self.assertGreater(self._channel.write_buffer_size, 0)
+        self.assertTrue(self._channel.write_paused)
+        self.assertEqual(self._receive(len(data) + 4), data + b'tail')
+        self.assertEqual(self._channel.write_buffer_size, 0)
+        self.assertFalse(self._channel.write_paused)
+
+    def test_write_keeps_order(self):
+        data = b'x' * 1048576
+
+        self._channel.write(data)
+        self._channel.write(b'y')
+
+        self.assertEqual(self._receive(len(data) + 1), data + b'y')
+
+    def test_flush_many_chunks(self):
+        self._channel.write(b'x' * 1048576)
+        chunks = [str(i).encode() for i in range(5000)]
+        self._channel.write(*chunks)
+
+        expected = b'x' * 1048576 + b''.join(chunks)
+        self.assertEqual(self._receive(len(expected)), expected)
+
+    def test_flush_empty(self):
+        self.assertTrue(self._channel.flush())
+
+    def test_close_flushes(self):
+        data = b'x' * 300000
+        self._channel.write(data)
+        self._channel.write(b'reply')
+        self.assertGreater(self._channel.write_buffer_size, 0)
+        self._server.setblocking(False)
+        received = b''
+        while True:
+            try:
+                received += self._server.recv(65536)
+            except BlockingIOError:
+                break
+
+        self._channel.close()
+
+        self._server.setblocking(True)
+        while True:
+            chunk = self._server.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+        self.assertEqual(received, data + b'reply')
+
+    def test_flush_closed(self):
+        self._channel.write(b'x' * 1048576)
+        self._server.close()
+
+        with self.assertRaises(EndpointClosedException):
+            self._channel.flush()
+
+
+class SocketChannelReadSizeTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self.addCleanup(self._client.close)
+
+    def test_read_size(self):
+        channel = SocketChannel(self._client, read_size=4)
+        self._server.send(b'hello, world')
+
+        self.assertEqual(channel.read(), b'hell')
+        self.assertEqual(channel.read_size, 4)
+
+    def test_adaptive(self):
+        channel = SocketChannel(self._client, read_size=4, max_read_size=16)
+        self._server.send(b'x' * 100)
+
+        self.assertEqual(len(channel.read()), 4)
+        self.assertEqual(channel.read_size, 8)
+        self.assertEqual(len(channel.read()), 8)
+        self.assertEqual(len(channel.read()), 16)
+        self.assertEqual(channel.read_size, 16)
+        self.assertEqual(len(channel.read()), 16)
+        self.assertEqual(channel.read_size, 16)
+
+        while channel.read():
+            pass
+        self._server.send(b'x')
+        self.assertEqual(channel.read(), b'x')
+        self.assertEqual(channel.read_size, 8)
+
+    def test_read_budget(self):
+        channel = SocketChannel(self._client, read_size=4, read_budget=10)
+        self._server.send(b'hello, world')
+
+        self.assertEqual(channel.read(), b'hello, wor')
+        self.assertEqual(channel.read(), b'ld')
+        self.assertEqual(channel.read(), b'')
+
+    def test_read_budget_closed(self):
+        channel = SocketChannel(self._client, read_size=4, read_budget=100)
+        self._server.send(b'hello, world')
+        self._server.close()
+
+        self.assertEqual(channel.read(), b'hello, world')
+        with self.assertRaises(EndpointClosedException):
+            channel.read()
@@ -0,0 +1,112 @@
+import unittest
+
+from channels.timers import TimerWheel
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimerWheelTest(unittest.TestCase):
+
+    def setUp(self):
+        self._clock = FakeClock()
+        self._wheel = TimerWheel(tick=1, size=8, clock=self._clock)
+        self._fired = []
+
+    def add(self, delay, name):
+        return self._wheel.call_later(delay, self._fired.append, name)
+
+    def advance(self, delta):
+        self._clock.now += delta
+        return self._wheel.run_expired()
+
+    def test_empty(self):
+        self.assertIsNone(self._wheel.next_deadline())
+        self.assertEqual(self.advance(1), 0)
+
+    def test_expire(self):
+        self.add(2.5, 'b')
+        self.add(1.5, 'a')
+
+        self.assertEqual(self._wheel.next_deadline(), 101.5)
+        self.assertEqual(self.advance(1), 0)
+        self.assertEqual(self.advance(1), 1)
+        self.assertEqual(self._fired, ['a'])
+        self.assertEqual(self._wheel.next_deadline(), 102.5)
+        self.advance(1)
+        self.assertEqual(self._fired, ['a', 'b'])
+        self.assertEqual(len(self._wheel), 0)
+
+    def test_same_tick(self):
+        self.add(0.7, 'late')
+
+        self.assertEqual(self.advance(0.5), 0)
+        self.assertEqual(self.advance(0.3), 1)
+
+    def test_cancel(self):
+        timer = self.add(1, 'a')
+        self.add(2, 'b')
+
+        timer.cancel()
+        timer.cancel()
+
+        self.assertTrue(timer.cancelled)
+        self.assertEqual(self._wheel.next_deadline(), 102)
+        self.advance(5)
+        self.assertEqual(self._fired, ['b'])
+
+    def test_cancel_many(self):
+        timers = [self.add(delay / 32, delay) for delay in range(1, 200)]
+        for timer in timers[:-1]:
+            timer.cancel()
+
+        self.assertEqual(len(self._wheel), 1)
+        self.assertEqual(self._wheel.next_deadline(), 100 + 199 / 32)
+        timers[-1].cancel()
+        self.assertIsNone(self._wheel.next_deadline())
+
+    def test_several_rounds(self):
+        self.add(20, 'far')
+        self.add(3, 'near')
+
+        self.assertEqual(self._wheel.next_deadline(), 103)
+        self.advance(4)
+        # a timer more than a turn ahead is looked for again a turn later
+        self.assertEqual(self._wheel.next_deadline(), 112)
+        self.advance(8)
+        self.assertEqual(self._wheel.next_deadline(), 120)
+        self.advance(4)
+        self.assertEqual(self._fired, ['near'])
+        self.advance(4)
+        self.assertEqual(self._fired, ['near', 'far'])
+
+    def test_long_gap(self):
+        for delay in (1, 5, 9, 30):
+            self.add(delay, delay)
+
+        self.advance(100)
+
+        self.assertEqual(self._fired, [1, 5, 9, 30])
+
+    def test_past_deadline(self):
+        self.advance(3)
+        self._wheel.call_at(50, self._fired.append, 'past')
+
+        self.assertEqual(self._wheel.next_deadline(), 50)
+        self.advance(0)
+        self.assertEqual(self._fired, ['past'])
+
+    def test_failing_callback(self):
+        self._wheel.call_later(1, lambda: 1/0)
+        self.add(1, 'a')
+
+        with self.assertLogs('channels.timers'):
+            self.advance(1)
+
+        self.assertEqual(self._fired, ['a'])
@@ -0,0 +1,205 @@
+import os
+import socket
+import time
+import unittest
+
+from channels import PipeChannel, SocketChannel
+from channels.channel import _IOV_MAX
+from channels.poller import Poller
+
+from utils import timeout
+
+
+class WriteBufferingTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self.addCleanup(self._client.close)
+        self._server.setblocking(False)
+
+    def channel(self, **kwargs):
+        return SocketChannel(self._client, write_buffering=True, **kwargs)
+
+    def received(self):
+        try:
+            return self._server.recv(65536)
+        except BlockingIOError:
+            return b''
+
+    def test_flush(self):
+        chan = self.channel()
+        sent = []
+        sendv = chan._sendv
+        chan._sendv = lambda chunks: sent.append(len(chunks)) or sendv(chunks)
+
+        self.assertEqual(chan.write(b'hello'), 0)
+        self.assertEqual(chan.write(b', ', b'world'), 0)
+        self.assertEqual(self.received(), b'')
+        self.assertEqual(chan.write_buffer_size, 12)
+
+        self.assertTrue(chan.flush())
+
+        self.assertEqual(self.received(), b'hello, world')
+        self.assertEqual(sent, [3])
+
+    def test_flush_threshold(self):
+        chan = self.channel(flush_threshold=10)
+
+        self.assertEqual(chan.write(b'hello'), 0)
+        self.assertEqual(chan.write(b'world'), 10)
+
+        self.assertEqual(self.received(), b'helloworld')
+
+    def test_flush_interval(self):
+        chan = self.channel(flush_interval=0.01)
+        chan.write(b'hello')
+        time.sleep(0.01)
+
+        self.assertEqual(chan.write(b'world'), 10)
+
+        self.assertEqual(self.received(), b'helloworld')
+
+    def test_close(self):
+        chan = self.channel()
+        chan.write(b'hello')
+
+        chan.close()
+
+        self.assertEqual(self.received(), b'hello')
+
+    def test_pipe(self):
+        faucet, sink = os.pipe()
+        self.addCleanup(os.close, faucet)
+        os.set_blocking(faucet, False)
+        chan = PipeChannel(sink=sink, write_buffering=True)
+        self.addCleanup(chan.close)
+
+        chan.write(b'hello')
+        with self.assertRaises(BlockingIOError):
+            os.read(faucet, 10)
+        chan.flush()
+
+        self.assertEqual(os.read(faucet, 10), b'hello')
+
+    def test_write_without_buffering(self):
+        chan = SocketChannel(self._client)
+
+        self.assertEqual(chan.write(b'hello'), 5)
+
+        self.assertEqual(self.received(), b'hello')
+
+
+class TcpOptionsTest(unittest.TestCase):
+
+    def setUp(self):
+        serv = socket.socket()
+        serv.bind(('127.0.0.1', 0))
+        serv.listen(1)
+        self.addCleanup(serv.close)
+        self._client = socket.create_connection(serv.getsockname())
+        self.addCleanup(self._client.close)
+        self._server, _ = serv.accept()
+        self.addCleanup(self._server.close)
+
+    def test_nodelay(self):
+        SocketChannel(self._client, nodelay=True)
+
+        self.assertTrue(self._client.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+
+    def test_cork(self):
+        chan = SocketChannel(self._client, write_buffering=True, cork=True)
+        chunks = [bytes([i % 256]) * 10 for i in range(_IOV_MAX * 2)]
+        corks = []
+        chan._sock = SocketChannelSockSpy(self._client, corks)
+
+        chan.write(*chunks)
+        chan.flush()
+
+        self.assertEqual(corks, [1, 0])
+        received = b''
+        with timeout(1):
+            while len(received) < len(chunks) * 10:
+                received += self._server.recv(65536)
+        self.assertEqual(received, b''.join(chunks))
+
+
+class SocketChannelSockSpy:
+
+    def __init__(self, sock, corks):
+        self._sock = sock
+        self._corks = corks
+
+    def setsockopt(self, level, option, value):
+        if option == socket.TCP_CORK:
+            self._corks.append(value)
+        self._sock.setsockopt(level, option, value)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+class PollerWriteBufferingTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poller = Poller()
+        self.addCleanup(self._poller.close_all)
+        self._server, client = socket.socketpair()
+        self.addCleanup(self._server.close)
+        self._server.setblocking(False)
+        self._client = client
+
+    def received(self):
+        try:
+            return self._server.recv(65536)
+        except BlockingIOError:
+            return b''
+
+    def test_flush_after_poll(self):
+        chan = SocketChannel(self._client, write_buffering=True)
+        self._poller.register(chan)
+        chan.write(b'hello')
+        chan.write(b'world')
+        self.assertEqual(self.received(), b'')
+
+        self._poller.poll(0)
+
+        self.assertEqual(self.received(), b'helloworld')
+        self.assertEqual(chan.write_buffer_size, 0)
+
+    def test_flush_during_iteration(self):
+        chan = SocketChannel(self._client, write_buffering=True)
+        self._poller.register(chan)
+        self._server.send(b'request')
+
+        for data, channel in self._poller.iter_events(0.01):
+            channel.write(b're: ', data)
+
+        self.assertEqual(self.received(), b're: request')
+
+    def test_flush_interval(self):
+        chan = SocketChannel(self._client, write_buffering=True, flush_interval=0.02)
+        self._poller.register(chan)
+        chan.write(b'hello')
+
+        self._poller.poll(0)
+        self.assertEqual(self.received(), b'')
+
+        with timeout(0.1):
+            self._poller.poll()
+
+        self.assertEqual(self.received(), b'hello')
+
+    def test_run(self):
+        chan = SocketChannel(self._client, write_buffering=True)
+        self._poller.register(chan)
+        self._server.send(b'request')
+
+        def on_data(data):
+            self._poller.stop()
+            return b're: ' + data
+
+        with timeout(1):
+            self._poller.run(on_data)
+
+        self.assertEqual(self.received(), b're: request')